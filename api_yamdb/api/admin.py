@@ -0,0 +1,93 @@
+"""Admin of the API app and base classes for admins of large tables."""
+from django.conf import settings
+from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .models import SlowQuery
+
+
+def estimate_rows(model, using):
+    """Return the planner row estimate of the model table or None."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)]
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that never counts more than ADMIN_COUNT_LIMIT rows.
+
+    Unfiltered lists of big tables show the planner estimate, filtered
+    lists count up to the limit, so pages past it are not linked.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = settings.ADMIN_COUNT_LIMIT
+        if not queryset.query.where:
+            estimate = estimate_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return queryset[:limit].count()
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """ModelAdmin for tables too big for COUNT(*) and LIKE searches.
+
+    exact_search_fields are compared with the search term by equality,
+    so the lookups use indexes. Terms that are not valid values of a
+    field skip that field.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    exact_search_fields = ()
+
+    def get_search_fields(self, request):
+        return self.search_fields or self.exact_search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.exact_search_fields or not search_term:
+            return super().get_search_results(
+                request, queryset, search_term)
+        query = Q()
+        for path in self.exact_search_fields:
+            field = queryset.model._meta.get_field(path.split('__')[0])
+            if field.is_relation and '__' in path:
+                field = field.related_model._meta.get_field(
+                    path.split('__')[1])
+            try:
+                value = field.to_python(search_term.strip())
+            except ValidationError:
+                continue
+            query |= Q(**{path: value})
+        if not query:
+            return queryset.none(), False
+        return queryset.filter(query), False
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('created', 'duration', 'view', 'method', 'path')
+    list_filter = ('view', 'method')
+    search_fields = ('sql', 'path')
+    readonly_fields = (
+        'created', 'duration', 'view', 'method', 'path', 'sql', 'params',
+        'plan'
+    )
+
+    def has_add_permission(self, request):
+        return False
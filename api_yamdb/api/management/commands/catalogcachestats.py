@@ -0,0 +1,23 @@
+from api import metrics
+from api.v1.cache import cache_stats
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Use this command to print catalog cache hit/miss counters'
+
+    def handle(self, *args, **options):
+        # Without the shared directory the command would only see the
+        # counters of its own process, which never serves a request.
+        if not metrics.is_shared():
+            raise CommandError(
+                'Set PROMETHEUS_MULTIPROC_DIR to the metrics directory '
+                'of the gunicorn workers'
+            )
+        stats = cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f'hit_ratio={ratio:.2%}'
+        )
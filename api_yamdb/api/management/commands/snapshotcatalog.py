@@ -0,0 +1,42 @@
+import time
+
+from api.snapshots import Snapshot
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Use this command to pre-render catalog pages for nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=settings.SNAPSHOT_PAGES,
+            help='Pages of titles rendered per category.'
+        )
+        parser.add_argument(
+            '--base-url', default=settings.SNAPSHOT_BASE_URL,
+            help='Scheme and host used in pagination links.'
+        )
+        parser.add_argument('--root', default=settings.SNAPSHOT_ROOT)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep refreshing the snapshot instead of rendering once.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=30,
+            help='Seconds between two refreshes.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            snapshot = Snapshot(
+                options['root'], options['base_url'], options['pages'])
+            removed = snapshot.build()
+            if snapshot.changed or removed or not options['loop']:
+                self.stdout.write(
+                    f'Snapshot: {len(snapshot.written)} files, '
+                    f'{snapshot.changed} updated, {removed} removed'
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,68 @@
+"""Request metrics in Prometheus text format.
+
+Series are kept with prometheus_client. When PROMETHEUS_MULTIPROC_DIR
+is set, which gunicorn.conf.py does by default, every worker writes its
+values to files in that directory and a scrape of any worker returns
+the sum over all of them.
+"""
+import os
+
+from prometheus_client import (CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+TIME_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+LABELS = ('route', 'method')
+
+registry = CollectorRegistry()
+
+
+def is_shared():
+    """Tell whether the series are summed over all worker processes."""
+    return 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+
+def collect():
+    """Return a registry with the series of all worker processes."""
+    if not is_shared():
+        return registry
+    collected = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collected)
+    return collected
+
+
+def render():
+    """Return all metrics in Prometheus text exposition format."""
+    return generate_latest(collect()).decode()
+
+
+RESPONSES = Counter(
+    'yamdb_responses_total', 'Responses by route and status.',
+    LABELS + ('status',), registry=registry
+)
+REQUEST_DURATION = Histogram(
+    'yamdb_request_duration_seconds', 'Time spent handling the request.',
+    LABELS, registry=registry, buckets=TIME_BUCKETS
+)
+VIEW_DURATION = Histogram(
+    'yamdb_view_duration_seconds', 'Time spent in the view.',
+    LABELS, registry=registry, buckets=TIME_BUCKETS
+)
+RENDER_DURATION = Histogram(
+    'yamdb_render_duration_seconds', 'Time spent rendering the response.',
+    LABELS, registry=registry, buckets=TIME_BUCKETS
+)
+DB_DURATION = Histogram(
+    'yamdb_db_duration_seconds', 'Time spent executing SQL queries.',
+    LABELS, registry=registry, buckets=TIME_BUCKETS
+)
+DB_QUERIES = Histogram(
+    'yamdb_db_queries', 'SQL queries executed per request.',
+    LABELS, registry=registry, buckets=QUERY_BUCKETS
+)
+CATALOG_CACHE = Counter(
+    'yamdb_catalog_cache', 'Catalog cache lookups by result.',
+    ('result',), registry=registry
+)
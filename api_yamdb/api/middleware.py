@@ -0,0 +1,162 @@
+"""Request instrumentation middleware."""
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics, replicas, slowqueries
+from .v1 import cache
+
+
+class QueryTimer:
+    """Execute wrapper that sums the time spent in SQL queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class ServerTimingMiddleware:
+    """Report SQL, view and render time in the Server-Timing header.
+
+    The same timings are aggregated per route into the histograms of
+    ``api.metrics``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._view_started = request._view_finished = None
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+        view_started = request._view_started or finished
+        view_finished = request._view_finished or finished
+        timings = {
+            'db': timer.duration,
+            'view': view_finished - view_started,
+            'render': finished - view_finished,
+            'total': finished - started,
+        }
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration * 1000:.2f}'
+            for name, duration in timings.items()
+        ) + f', queries;desc="{timer.count}"'
+        self.record(request, response, timings, timer.count)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered by the handler after this hook.
+        request._view_finished = time.perf_counter()
+        return response
+
+    def record(self, request, response, timings, queries):
+        match = request.resolver_match
+        labels = (
+            match.view_name if match else 'unmatched', request.method
+        )
+        metrics.RESPONSES.labels(*labels, response.status_code).inc()
+        metrics.REQUEST_DURATION.labels(*labels).observe(timings['total'])
+        metrics.VIEW_DURATION.labels(*labels).observe(timings['view'])
+        metrics.RENDER_DURATION.labels(*labels).observe(timings['render'])
+        metrics.DB_DURATION.labels(*labels).observe(timings['db'])
+        metrics.DB_QUERIES.labels(*labels).observe(queries)
+
+
+class SlowQueryMiddleware:
+    """Store slow SQL queries of a sample of requests with their plans.
+
+    Enabled by SLOW_QUERY_CAPTURE. Only SLOW_QUERY_SAMPLE_RATE of the
+    requests get their queries timed and at most SLOW_QUERY_LIMIT queries
+    per request are explained, after the response is built. It comes
+    before ServerTimingMiddleware, which does not time that work.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_CAPTURE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+            return self.get_response(request)
+        request._slow_query_view = ''
+        recorders = []
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    recorder = slowqueries.SlowQueryRecorder(
+                        connection.alias, settings.SLOW_QUERY_THRESHOLD_MS,
+                        settings.SLOW_QUERY_LIMIT
+                    )
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                    recorders.append(recorder)
+                return self.get_response(request)
+        finally:
+            for recorder in recorders:
+                slowqueries.record(
+                    recorder, request._slow_query_view, request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        name = getattr(view_func, 'view_class', view_func).__name__
+        action = (getattr(view_func, 'actions', None) or {}).get(
+            request.method.lower())
+        request._slow_query_view = f'{name}.{action}' if action else name
+
+
+class ReplicaMiddleware:
+    """Read from a replica during GET and HEAD requests.
+
+    See ``api.replicas`` for the routing rules.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = replicas.begin(
+            request.method in ('GET', 'HEAD')
+            and not replicas.is_sticky(request)
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            state = replicas.end(token)
+        if state.wrote:
+            replicas.stick(response)
+        return response
+
+
+class CacheVersionMiddleware:
+    """Read each catalog cache version at most once per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = cache.request_versions.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            cache.request_versions.reset(token)
@@ -0,0 +1,35 @@
+# Generated by Django 3.2 on 2026-10-18 20:42
+
+import time
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    CacheVersion = apps.get_model('api', 'CacheVersion')
+    CacheVersion.objects.using(schema_editor.connection.alias).bulk_create(
+        CacheVersion(resource=resource, version=time.time_ns())
+        for resource in ('categories', 'genres', 'titles')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_slow_query'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('resource', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Ресурс')),
+                ('version', models.BigIntegerField(verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'версия кеша',
+                'verbose_name_plural': 'версии кеша',
+            },
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
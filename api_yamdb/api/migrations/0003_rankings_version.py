@@ -0,0 +1,22 @@
+import time
+
+from django.db import migrations
+
+
+def create_version(apps, schema_editor):
+    CacheVersion = apps.get_model('api', 'CacheVersion')
+    CacheVersion.objects.using(schema_editor.connection.alias).bulk_create(
+        [CacheVersion(resource='rankings', version=time.time_ns())],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_cache_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
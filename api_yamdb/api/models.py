@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """SQL query that exceeded SLOW_QUERY_THRESHOLD_MS."""
+
+    created = models.DateTimeField(
+        'Записан', auto_now_add=True, db_index=True)
+    duration = models.FloatField('Длительность, мс')
+    sql = models.TextField('SQL')
+    params = models.TextField('Параметры', blank=True)
+    view = models.CharField('View', max_length=200, blank=True)
+    method = models.CharField('Метод', max_length=10, blank=True)
+    path = models.CharField('Путь', max_length=2000, blank=True)
+    plan = models.TextField('План', blank=True)
+
+    class Meta:
+        """Slow query meta class."""
+
+        ordering = ['-created']
+        verbose_name = 'медленный запрос'
+        verbose_name_plural = 'медленные запросы'
+
+    def __str__(self):
+        return f'{self.duration:.1f} ms {self.view}'
+
+
+class CacheVersion(models.Model):
+    """Version counter of a cached catalog resource, see api/v1/cache.py."""
+
+    resource = models.CharField('Ресурс', max_length=50, primary_key=True)
+    version = models.BigIntegerField('Версия')
+
+    class Meta:
+        """Cache version meta class."""
+
+        verbose_name = 'версия кеша'
+        verbose_name_plural = 'версии кеша'
+
+    def __str__(self):
+        return f'{self.resource}: {self.version}'
@@ -0,0 +1,87 @@
+"""Routing of read queries to database replicas.
+
+Queries made while handling GET and HEAD requests are read from one of
+the DATABASE_REPLICAS aliases until the request writes something; from
+then on the rest of the request uses the primary. Clients that wrote
+recently are kept on the primary for REPLICA_STICKY_SECONDS, so they
+read their own writes despite replication lag.
+
+The sticky marker is a signed cookie carrying its own timestamp: it
+follows the client to any worker and every client, anonymous ones
+included, gets its own. Response bodies streamed after the middleware
+returned must pin their querysets to read_alias() themselves.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+STICKY_COOKIE = 'replica_sticky'
+STICKY_SALT = 'api.replicas.sticky'
+
+current = ContextVar('replica_state', default=None)
+
+
+class RequestState:
+    """Database selection of the current request."""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+def begin(use_replica):
+    replica = None
+    if use_replica and settings.DATABASE_REPLICAS:
+        replica = random.choice(settings.DATABASE_REPLICAS)
+    return current.set(RequestState(replica))
+
+
+def end(token):
+    try:
+        return current.get()
+    finally:
+        current.reset(token)
+
+
+def read_alias():
+    """Return the database reads of the current request go to."""
+    state = current.get()
+    if state is None or state.wrote or state.replica is None:
+        return DEFAULT_DB_ALIAS
+    return state.replica
+
+
+def is_sticky(request):
+    """Return whether the client wrote within REPLICA_STICKY_SECONDS."""
+    return request.get_signed_cookie(
+        STICKY_COOKIE, default=None, salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS
+    ) is not None
+
+
+def stick(response):
+    response.set_signed_cookie(
+        STICKY_COOKIE, '1', salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS,
+        secure=settings.SESSION_COOKIE_SECURE, httponly=True,
+        samesite='Lax'
+    )
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the request."""
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = current.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary's rows.
+        return True
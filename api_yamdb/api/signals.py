@@ -0,0 +1,47 @@
+"""Signal receivers for API app."""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.deletion import purging
+from reviews.models import Category, Genre, GenreTitle, Title
+from reviews.ratings import score_applied
+
+from .v1.cache import bump_on_commit, title_resource
+
+# Resources whose cached responses render each model.
+CACHED_RESOURCES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles',),
+    GenreTitle: ('titles',),
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Bump cache versions on writes from the API or the admin."""
+    if sender in CACHED_RESOURCES and not purging.get():
+        bump_on_commit(*CACHED_RESOURCES[sender])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_on_commit('titles')
+
+
+@receiver(score_applied, sender=Title)
+def invalidate_title_rating(sender, title_id, previous, rating, **kwargs):
+    """Bump the title page and the rankings on review score changes.
+
+    Lists render the rating as an integer (TitleSerializer), so their
+    pages are dropped only when that number moves.
+    """
+    resources = [title_resource(title_id), 'rankings']
+    if shown_rating(previous) != shown_rating(rating):
+        resources.append('titles')
+    bump_on_commit(*resources)
+
+
+def shown_rating(rating):
+    return None if rating is None else int(rating)
@@ -0,0 +1,85 @@
+"""Capture of slow SQL queries together with their query plans."""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN = {
+    'postgresql': ('EXPLAIN ', 'EXPLAIN (ANALYZE, BUFFERS) '),
+    'sqlite': ('EXPLAIN QUERY PLAN ', 'EXPLAIN QUERY PLAN '),
+}
+READS = ('SELECT', 'WITH')
+
+
+class SlowQueryRecorder:
+    """Execute wrapper that keeps queries slower than the threshold."""
+
+    def __init__(self, alias, threshold, limit):
+        self.alias = alias
+        self.threshold = threshold
+        self.limit = limit
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            if duration >= self.threshold and len(self.queries) < self.limit:
+                self.queries.append(
+                    (duration, sql, None if many else params))
+
+
+def explainable(connection, sql, params):
+    """Return whether the query is a read the backend can explain."""
+    statement = sql.lstrip().split(None, 1)[0].upper()
+    return (
+        connection.vendor in EXPLAIN and params is not None
+        and statement in READS
+    )
+
+
+def explain(alias, sql, params):
+    """Return the query plan of a read query or an empty string."""
+    connection = connections[alias]
+    if not explainable(connection, sql, params):
+        return ''
+    # ANALYZE runs the query again, which is only safe for reads.
+    prefix = EXPLAIN[connection.vendor][settings.SLOW_QUERY_EXPLAIN_ANALYZE]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+    except Exception as error:
+        return f'EXPLAIN failed: {error}'
+
+
+def record(recorder, view, request):
+    """Log and store the queries kept by the recorder.
+
+    Parameters are kept only for the reads that are explained. Writes
+    carry password hashes and confirmation codes, so theirs are
+    dropped.
+    """
+    connection = connections[recorder.alias]
+    for duration, sql, params in recorder.queries:
+        if not explainable(connection, sql, params):
+            params = None
+        plan = explain(recorder.alias, sql, params)
+        logger.warning(
+            '%.1f ms %s %s %s\n%s\nparams=%s\n%s',
+            duration, view, request.method, request.path, sql,
+            'redacted' if params is None else repr(params), plan
+        )
+        SlowQuery.objects.create(
+            duration=duration, sql=sql,
+            params='' if params is None else repr(params),
+            view=view, method=request.method, path=request.path[:2000],
+            plan=plan
+        )
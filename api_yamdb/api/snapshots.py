@@ -0,0 +1,125 @@
+"""Pre-rendered catalog pages that nginx serves without hitting Django.
+
+Each page is stored as JSON next to its gzip and brotli variants under
+SNAPSHOT_ROOT, at the request path plus a name derived from the query
+string (index, page-2, category-films, category-films-page-2). The map
+in infra/nginx/default.conf derives the same name from $args.
+"""
+import gzip
+import os
+import tempfile
+from urllib.parse import urlsplit
+
+from django.test import RequestFactory
+from django.urls import resolve
+from reviews.models import Category
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+API_PREFIX = '/api/v1/'
+
+
+def snapshot_name(params):
+    """Return the file name of the page requested with params."""
+    parts = [f'{key}-{params[key]}' for key in ('category', 'page')
+             if key in params]
+    return '-'.join(parts) or 'index'
+
+
+def encodings(content):
+    """Return the file suffixes with the content encoded for each."""
+    variants = {'': content, '.gz': gzip.compress(content, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content)
+    return variants
+
+
+def write_atomic(path, content):
+    """Replace the file at path unless it already holds the content.
+
+    Readers see either the old or the new file, never a partial one.
+    """
+    try:
+        with open(path, 'rb') as file:
+            if file.read() == content:
+                return False
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+class Snapshot:
+    """Render anonymous catalog pages and store them under root."""
+
+    def __init__(self, root, base_url, pages):
+        self.root = root
+        url = urlsplit(base_url)
+        self.factory = RequestFactory(HTTP_HOST=url.netloc)
+        self.secure = url.scheme == 'https'
+        self.pages = pages
+        self.written = set()
+        self.changed = 0
+
+    def render(self, path, params):
+        """Return the rendered JSON page or None if it is not a 200."""
+        request = self.factory.get(
+            path, params, secure=self.secure, HTTP_ACCEPT='application/json')
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        response.render()
+        if response.status_code != 200:
+            return None
+        return response
+
+    def save(self, path, params):
+        """Store one page, return its data or None if it was not stored."""
+        response = self.render(path, params)
+        if response is None:
+            return None
+        name = os.path.join(
+            self.root, path.strip('/'), snapshot_name(params) + '.json')
+        for suffix, content in encodings(response.content).items():
+            self.written.add(name + suffix)
+            self.changed += write_atomic(name + suffix, content)
+        return response.data
+
+    def save_pages(self, path, params=None):
+        for page in range(1, self.pages + 1):
+            page_params = dict(params or {})
+            if page > 1:
+                page_params['page'] = page
+            data = self.save(path, page_params)
+            if data is None or not data.get('next'):
+                return
+
+    def build(self):
+        """Render every snapshot page and drop files that became stale."""
+        self.save_pages(f'{API_PREFIX}categories/')
+        self.save_pages(f'{API_PREFIX}genres/')
+        self.save_pages(f'{API_PREFIX}titles/')
+        for slug in Category.objects.values_list('slug', flat=True):
+            self.save_pages(f'{API_PREFIX}titles/', {'category': slug})
+        return self.prune()
+
+    def prune(self):
+        """Remove files left from pages that no longer exist."""
+        removed = 0
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                if path not in self.written:
+                    os.unlink(path)
+                    removed += 1
+        return removed
@@ -0,0 +1,150 @@
+"""Versioned response cache for anonymous catalog reads.
+
+Every cached resource has a version counter stored in the database, so
+all worker processes see the same one even when the cache is local to
+each of them. The version is part of each response key and of the
+ETag of catalog lists, so bumping it on writes makes all cached pages
+of the resource unreachable at once. A response can render several
+resources: a title page also holds the version of that one title, which
+review writes bump, and the rankings hold the 'rankings' version.
+CacheVersionMiddleware keeps the versions read by a request, so each is
+queried once per request.
+"""
+import hashlib
+import time
+from contextvars import ContextVar
+
+from api import metrics
+from api.models import CacheVersion
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+RESPONSE_KEY = 'catalog:response:{}:{}:{}'
+TITLE_RESOURCE = 'title:{}'
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 0.05
+
+request_versions = ContextVar('catalog_versions', default=None)
+
+
+def read_versions(resources):
+    versions = CacheVersion.objects.filter(pk__in=resources)
+    found = dict(versions.values_list('resource', 'version'))
+    # A title gets its row on the first bump. Its pages also hold the
+    # 'titles' version, so reading the missing row as 0 reuses no key.
+    missing = [
+        resource for resource in resources if resource not in found
+        and not resource.startswith(TITLE_RESOURCE.format(''))
+    ]
+    if not missing:
+        return {resource: found.get(resource, 0) for resource in resources}
+    create_versions(missing)
+    return read_versions(resources)
+
+
+def create_versions(resources):
+    # Start from the clock, so a recreated counter never hands out
+    # a version that was already used for cached content.
+    CacheVersion.objects.bulk_create(
+        [
+            CacheVersion(resource=resource, version=time.time_ns())
+            for resource in resources
+        ],
+        ignore_conflicts=True
+    )
+
+
+def get_versions(*resources):
+    """Return the current version counters of the resources."""
+    versions = request_versions.get()
+    if versions is None:
+        versions = {}
+    missing = [resource for resource in resources if resource not in versions]
+    if missing:
+        versions.update(read_versions(missing))
+    return [versions[resource] for resource in resources]
+
+
+def get_version(resource):
+    """Return the current version counter of the resource."""
+    return get_versions(resource)[0]
+
+
+def get_stamp(resources):
+    """Return the combined version of the resources a response renders."""
+    return '.'.join(str(version) for version in get_versions(*resources))
+
+
+def title_resource(pk):
+    """Name the resource of one title, which its review writes bump."""
+    return TITLE_RESOURCE.format(pk)
+
+
+def bump_version(*resources):
+    """Invalidate every cached response of the resources."""
+    resources = set(resources)
+    versions = request_versions.get() or {}
+    for resource in resources:
+        versions.pop(resource, None)
+    if CacheVersion.objects.filter(pk__in=resources).update(
+            version=F('version') + 1) < len(resources):
+        create_versions(resources)
+
+
+def bump_on_commit(*resources):
+    """Invalidate the resources once the current transaction commits.
+
+    A version bumped before the commit lets a concurrent read cache the
+    old rows under the new version until CATALOG_CACHE_TIMEOUT.
+    """
+    transaction.on_commit(lambda: bump_version(*resources))
+
+
+def cache_stats():
+    """Return hit/miss counters of the catalog cache.
+
+    The counters live in the metrics registry, so with
+    PROMETHEUS_MULTIPROC_DIR set they are summed over all workers.
+    """
+    collected = metrics.collect()
+    return {
+        name: int(collected.get_sample_value(
+            'yamdb_catalog_cache_total', {'result': name}) or 0)
+        for name in ('hits', 'misses')
+    }
+
+
+def fetch(resources, path, render):
+    """Return cached data for the path or store what render() returns.
+
+    The key holds the versions of all resources the response renders.
+    Only one caller renders a missing page, others wait for its result
+    for up to LOCK_TIMEOUT seconds. render() returns None for responses
+    that must not be cached.
+    """
+    digest = hashlib.md5(path.encode()).hexdigest()
+    key = RESPONSE_KEY.format(
+        ':'.join(resources), get_stamp(resources), digest)
+    lock = f'{key}:lock'
+    data = cache.get(key)
+    locked = data is None and cache.add(lock, 1, LOCK_TIMEOUT)
+    if data is None and not locked:
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while (data is None and time.monotonic() < deadline
+               and cache.get(lock) is not None):
+            time.sleep(LOCK_WAIT)
+            data = cache.get(key)
+    if data is not None:
+        metrics.CATALOG_CACHE.labels('hits').inc()
+        return data
+    metrics.CATALOG_CACHE.labels('misses').inc()
+    try:
+        data = render()
+        if data is not None:
+            cache.set(key, data, settings.CATALOG_CACHE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(lock)
+    return data
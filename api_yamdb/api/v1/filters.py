@@ -1,5 +1,6 @@
 import django_filters
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+from reviews.search import search_titles
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -8,11 +9,20 @@ class TitleFilter(django_filters.FilterSet):
     category = django_filters.CharFilter(
         field_name='category__slug'
     )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug'
-    )
+    genre = django_filters.CharFilter(method='filter_genre')
     name = django_filters.CharFilter(field_name='name', lookup_expr='contains')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'name', 'year')
+        fields = ('category', 'genre', 'name', 'year', 'search')
+
+    def filter_genre(self, queryset, name, value):
+        # Titles of the genre are found through the genre links index
+        # and sorted; walking all titles in name order and checking
+        # each one reads the whole table for rare genres and counts.
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__slug=value).values('title'))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,176 @@
+"""Viewset mixins for API V1."""
+import hashlib
+from datetime import datetime
+from functools import partial
+from itertools import chain
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from . import cache
+
+
+def wrap_handler(view, request, wrapper):
+    """Route the request handler of the view through wrapper."""
+    method = request.method.lower()
+    setattr(view, method, partial(wrapper, getattr(view, method)))
+
+
+class CatalogCacheMixin:
+    """Serve anonymous reads from the versioned catalog cache."""
+
+    cache_resource = None
+    cached_actions = ('list',)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (request.method in ('GET', 'HEAD')
+                and self.action in self.cached_actions
+                and not request.user.is_authenticated):
+            wrap_handler(self, request, self.cached_response)
+
+    def get_cache_resources(self):
+        """Return the resources whose versions key the cached response."""
+        return (self.cache_resource,)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        response = None
+
+        def render():
+            nonlocal response
+            response = handler(request, *args, **kwargs)
+            if response.status_code == 200:
+                return response.data
+            return None
+
+        data = cache.fetch(
+            self.get_cache_resources(), request.get_full_path(), render)
+        return response if response is not None else Response(data)
+
+
+class ConditionalGetMixin:
+    """Answer 304 Not Modified without running the query or serializer.
+
+    get_validators() returns a cheap change stamp of the requested data
+    and, optionally, its last modification time.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (request.method in ('GET', 'HEAD')
+                and self.action in self.conditional_actions):
+            wrap_handler(self, request, self.conditional_response)
+
+    def get_validators(self):
+        return None, None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        stamp, last_modified = self.get_validators()
+        if stamp is None:
+            return handler(request, *args, **kwargs)
+        if isinstance(stamp, datetime):
+            # Two writes within one second must give different ETags.
+            stamp = stamp.isoformat(timespec='microseconds')
+        etag = quote_etag(hashlib.md5(
+            f'{stamp}:{request.get_full_path()}'.encode()).hexdigest())
+        # If-Modified-Since is compared with the exact time, so a write
+        # later in the second of the client's copy is not answered 304.
+        # Only the Last-Modified header is cut to whole seconds.
+        if last_modified is not None:
+            last_modified = last_modified.timestamp()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(int(last_modified))
+        return response
+
+
+class SparseFieldsetMixin:
+    """Let list requests pick the rendered fields with ?fields= or ?omit=.
+
+    Omitted fields are dropped from the serializer and their columns are
+    deferred, except the ordering fields of a cursor paginator.
+    sparse_columns maps a serializer field to the columns it reads (the
+    field name by default), sparse_select_related and
+    sparse_prefetch_related map it to the relations it needs.
+    """
+
+    sparse_actions = ('list',)
+    sparse_columns = {}
+    sparse_select_related = {}
+    sparse_prefetch_related = {}
+
+    def get_sparse_fields(self):
+        """Return the requested readable fields or None for all of them."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        params = self.request.query_params
+        if (self.action not in self.sparse_actions
+                or not ('fields' in params or 'omit' in params)):
+            return None
+        readable = [
+            name for name, field
+            in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        ]
+        requested = {
+            param: {name for name in params[param].split(',') if name}
+            for param in ('fields', 'omit') if param in params
+        }
+        errors = {
+            param: [f'Unknown field: {name}.' for name in sorted(names)]
+            for param, names in requested.items()
+            if names - set(readable)
+        }
+        if errors:
+            raise ValidationError(errors)
+        fields = requested.get('fields', set(readable))
+        return fields - requested.get('omit', set())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            child = getattr(serializer, 'child', serializer)
+            for name in set(child.fields) - fields:
+                if not child.fields[name].write_only:
+                    child.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        queryset = queryset.select_related(None).prefetch_related(None)
+        select = [
+            relation for field, relation
+            in self.sparse_select_related.items() if field in fields
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        prefetch = [
+            lookup for field, lookup
+            in self.sparse_prefetch_related.items() if field in fields
+        ]
+        columns = chain.from_iterable(
+            self.sparse_columns.get(field, (field,)) for field in fields)
+        if isinstance(self.paginator, CursorPagination):
+            # The cursor is built from the ordering fields of the rows.
+            columns = chain(columns, (
+                order.lstrip('-') for order in self.paginator.get_ordering(
+                    self.request, queryset, self)
+            ))
+        return queryset.prefetch_related(*prefetch).only('pk', *columns)
@@ -0,0 +1,146 @@
+"""Pagination for API V1."""
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination keyed on every field of the ordering.
+
+    CursorPagination filters on the first ordering field only and skips
+    the rows tied on it with an OFFSET, so pages over many equal values
+    scan all of them. Here the cursor position holds the values of all
+    ordering fields, which must end with a unique one, and a page starts
+    right after the row it was taken from.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = self.filter_after(queryset, current_position, reverse)
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = (
+            self._get_position_from_instance(results[-1], self.ordering)
+            if has_following_position else None
+        )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def filter_after(self, queryset, position, reverse):
+        """Keep the rows past the position in the page direction."""
+        try:
+            values = json.loads(position)
+            if len(values) != len(self.ordering):
+                raise ValueError
+            conditions = []
+            for index, (order, value) in enumerate(
+                    zip(self.ordering, values)):
+                field = order.lstrip('-')
+                lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+                ties = {
+                    other.lstrip('-'): tied
+                    for other, tied in zip(self.ordering[:index], values)
+                }
+                conditions.append(reduce(
+                    and_, (Q(**{name: tied}) for name, tied in ties.items()),
+                    Q(**{f'{field}__{lookup}': value})
+                ))
+            return queryset.filter(reduce(or_, conditions))
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if isinstance(instance, dict):
+                values.append(instance[field_name])
+            else:
+                values.append(getattr(instance, field_name))
+        return json.dumps(values, default=str)
+
+
+class ReviewCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over the review publication date index."""
+
+    ordering = ('-pub_date', '-id')
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over the comment publication date index."""
+
+    ordering = ('pub_date', 'id')
+
+
+class TopTitleCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over the weighted rating index."""
+
+    ordering = ('-weighted_rating', '-id')
+
+
+class TrendingTitleCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over the trending window counter index."""
+
+    ordering = ('-recent_reviews', '-id')
+
+
+class CursorPaginationMixin:
+    """Paginate with cursor_pagination_class when the client opts in.
+
+    Clients ask for the first keyset page with ``?pagination=cursor``,
+    the following pages carry the ``cursor`` parameter in their links.
+    Requests without either keep the default page number pagination.
+    """
+
+    cursor_pagination_class = None
+    pagination_query_param = 'pagination'
+
+    def use_cursor_pagination(self):
+        query_params = self.request.query_params
+        return self.cursor_pagination_class is not None and (
+            self.cursor_pagination_class.cursor_query_param in query_params
+            or query_params.get(self.pagination_query_param) == 'cursor'
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.use_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
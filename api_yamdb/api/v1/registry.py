@@ -0,0 +1,58 @@
+"""In-process snapshots of the category and genre reference data.
+
+Title writes name categories and genres by slug. A registry resolves
+all slugs of a request at once from a snapshot of the whole table. The
+snapshot is reloaded when the catalog cache version of the resource
+moves, which writes in any worker do, or after REGISTRY_TIMEOUT
+seconds. Slugs missing from the snapshot are looked up in the database
+before being rejected.
+"""
+import time
+
+from django.conf import settings
+from reviews.models import Category, Genre
+
+from .cache import get_version
+
+
+class Registry:
+    """Resolve slugs of one reference model."""
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        self.snapshot = (None, 0, {})
+
+    def objects(self):
+        """Return the current slug to object map."""
+        version, expires, objects = self.snapshot
+        current = get_version(self.resource)
+        if version != current or time.monotonic() > expires:
+            objects = self.model.objects.in_bulk(field_name='slug')
+            self.snapshot = (
+                current, time.monotonic() + settings.REGISTRY_TIMEOUT,
+                objects
+            )
+        return objects
+
+    def resolve(self, slugs):
+        """Return a slug to object map of the slugs that exist."""
+        objects = self.objects()
+        found = {slug: objects[slug] for slug in slugs if slug in objects}
+        missing = set(slugs) - found.keys()
+        if missing:
+            found.update(
+                self.model.objects.in_bulk(missing, field_name='slug'))
+        return found
+
+    def clear(self):
+        self.snapshot = (None, 0, {})
+
+    def __deepcopy__(self, memo):
+        # Serializer fields deep copy their arguments, the snapshot
+        # must stay shared by every copy.
+        return self
+
+
+categories = Registry(Category, 'categories')
+genres = Registry(Genre, 'genres')
@@ -0,0 +1,52 @@
+"""Renderers in API app."""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer built on orjson, byte-compatible with JSONRenderer.
+
+    Values orjson does not know, such as lazy translation strings, and
+    datetimes, so they keep DRF's format, go through DRF's encoder.
+    Falls back to JSONRenderer when orjson is not installed or indented
+    output is requested.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(
+                accepted_media_type, renderer_context):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+        content = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.options)
+        # Like JSONRenderer, escape the separators that break JavaScript.
+        return content.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Render metrics in Prometheus text exposition format."""
+
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            # Error responses carry a dict with the error details.
+            data = f"{data.get('detail', data)}\n"
+        return data.encode(self.charset)
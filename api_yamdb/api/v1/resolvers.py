@@ -0,0 +1,33 @@
+"""Parent objects of nested routes, resolved once per request."""
+
+from django.shortcuts import get_object_or_404
+from reviews.models import Review, Title
+
+
+def get_parents(request):
+    """Return the title and review named by the URL of a nested route.
+
+    A review is loaded together with its title in one joined query. The
+    result is kept on the request, so the view, its permissions and the
+    serializer defaults share it. The review is None on title routes.
+    """
+    if not hasattr(request, '_parents'):
+        kwargs = request.parser_context['kwargs']
+        if 'review_id' in kwargs:
+            review = get_object_or_404(
+                Review.objects.select_related('title'),
+                title_id=kwargs['title_id'], id=kwargs['review_id'],
+                title__deleted__isnull=True, author__deleted__isnull=True)
+            request._parents = (review.title, review)
+        else:
+            request._parents = (
+                get_object_or_404(Title, id=kwargs['title_id']), None)
+    return request._parents
+
+
+def get_title(request):
+    return get_parents(request)[0]
+
+
+def get_review(request):
+    return get_parents(request)[1]
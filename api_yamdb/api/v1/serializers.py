@@ -1,11 +1,19 @@
 """Serializers for API app."""
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError
+from django.db.models import (Case, DateTimeField, Value, When,
+                              prefetch_related_objects)
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.ratings import rebuild_ratings
 
+from . import registry
+from .cache import bump_on_commit
+from .resolvers import get_review, get_title
 from .validators import regexp_validator
 
 User = get_user_model()
@@ -45,19 +53,88 @@ class TitleSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = (
+            'rating_sum', 'rating_count', 'modified', 'weighted_rating',
+            'recent_reviews', 'deleted'
+        )
         model = Title
 
 
+class TitleRankingSerializer(TitleSerializer):
+    """A serializer for titles of the top and trending lists."""
+
+    class Meta(TitleSerializer.Meta):
+        exclude = ('rating_sum', 'rating_count', 'modified', 'deleted')
+
+
+class RegistryField(serializers.CharField):
+    """A category or genre named by its slug and resolved by a registry."""
+
+    default_error_messages = {
+        'does_not_exist': 'Object with slug={value} does not exist.',
+    }
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        slug = super().to_internal_value(data)
+        obj = self.registry.resolve([slug]).get(slug)
+        if obj is None:
+            self.fail('does_not_exist', value=slug)
+        return obj
+
+    def to_representation(self, value):
+        return value.slug
+
+
+class RegistryListField(serializers.ListField):
+    """A list of genres or categories resolved by a registry at once."""
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        super().__init__(child=serializers.CharField(), **kwargs)
+
+    def to_internal_value(self, data):
+        slugs = list(dict.fromkeys(super().to_internal_value(data)))
+        objects = self.registry.resolve(slugs)
+        missing = [slug for slug in slugs if slug not in objects]
+        if missing:
+            raise serializers.ValidationError([
+                f'Object with slug={slug} does not exist.' for slug in missing
+            ])
+        return [objects[slug] for slug in slugs]
+
+    def to_representation(self, data):
+        return [value.slug for value in data]
+
+
+def link_genres(title, genres, created=False):
+    """Make genres the genres of the title with bulk writes."""
+    wanted = {genre.pk for genre in genres}
+    current = set() if created else set(
+        GenreTitle.objects.filter(title=title).values_list(
+            'genre_id', flat=True)
+    )
+    if current - wanted:
+        GenreTitle.objects.filter(
+            title=title, genre_id__in=current - wanted).delete()
+    if wanted - current:
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre_id=genre_id)
+            for genre_id in wanted - current
+        )
+    if current != wanted:
+        # Bulk writes skip the signals that invalidate the catalog cache.
+        bump_on_commit('titles')
+
+
 class CreateUpdateTitleSerializer(TitleSerializer):
     """A serializer for create/update Title instances."""
 
-    category = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Category.objects
-    )
-    genre = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Genre.objects, many=True
-    )
+    category = RegistryField(registry.categories)
+    genre = RegistryListField(registry.genres)
 
     class Meta:
         fields = ('name', 'year', 'description', 'category', 'genre')
@@ -69,21 +146,151 @@ class CreateUpdateTitleSerializer(TitleSerializer):
             )
         ]
 
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = Title.objects.create(**validated_data)
+        link_genres(title, genres, created=True)
+        return title
+
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        instance = super().update(instance, validated_data)
+        if genres is not None:
+            link_genres(instance, genres)
+        return instance
+
     def to_representation(self, instance):
         request = self.context.get('request')
         context = {'request': request}
         return TitleSerializer(instance, context=context).data
 
 
+class BatchListSerializer(serializers.ListSerializer):
+    """A list serializer that validates its items as a set.
+
+    Subclasses check the items that passed field validation together in
+    ``validate_items`` and add their errors to the per-item error list.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+        if len(data) > settings.BATCH_MAX_SIZE:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Ensure this field has no more than '
+                    f'{settings.BATCH_MAX_SIZE} elements.'
+                ]
+            })
+        items, errors = [], []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append(None)
+                errors.append(exc.detail)
+        self.validate_items(
+            [item for item in items if item is not None],
+            [error for item, error in zip(items, errors) if item is not None]
+        )
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def validate_items(self, items, errors):
+        """Check the valid items together, a hook for subclasses.
+
+        Errors are added to the dict of the item in ``errors``. The base
+        class has no set-wide rules and accepts every item.
+        """
+
+
+class TitleBatchListSerializer(BatchListSerializer):
+    """Validate a list of titles as a set and insert it in bulk."""
+
+    def validate_items(self, items, errors):
+        categories = registry.categories.resolve(
+            {item['category'] for item in items})
+        genres = registry.genres.resolve(
+            {slug for item in items for slug in item['genre']})
+        existing = set(Title.objects.filter(
+            name__in={item['name'] for item in items}
+        ).values_list('name', 'year', 'category__slug'))
+        for item, error in zip(items, errors):
+            key = (item['name'], item['year'], item['category'])
+            if item['category'] not in categories:
+                error['category'] = [
+                    f'Object with slug={item["category"]} does not exist.']
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                error['genre'] = [
+                    f'Object with slug={slug} does not exist.'
+                    for slug in missing
+                ]
+            if key in existing:
+                error['non_field_errors'] = [
+                    'The fields name, year, category must make a unique set.'
+                ]
+            existing.add(key)
+            if not error:
+                item['category'] = categories[item['category']]
+                item['genre'] = [genres[slug] for slug in item['genre']]
+
+    def create(self, validated_data):
+        titles = Title.objects.bulk_create(
+            Title(**{
+                field: value for field, value in item.items()
+                if field != 'genre'
+            })
+            for item in validated_data
+        )
+        if titles and titles[0].pk is None:
+            # Only some databases return primary keys of bulk inserts.
+            ids = {
+                (name, year, category_id): pk
+                for pk, name, year, category_id in Title.objects.filter(
+                    name__in={title.name for title in titles}
+                ).values_list('pk', 'name', 'year', 'category_id')
+            }
+            for title in titles:
+                title.pk = ids[(title.name, title.year, title.category_id)]
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre)
+            for title, item in zip(titles, validated_data)
+            for genre in item['genre']
+        )
+        prefetch_related_objects(titles, 'genre')
+        return titles
+
+    def to_representation(self, data):
+        # One read serializer for the whole list instead of one per title.
+        return TitleSerializer(
+            many=True, context=self.context).to_representation(data)
+
+
+class TitleBatchSerializer(CreateUpdateTitleSerializer):
+    """A serializer for one title of a batch."""
+
+    category = serializers.SlugField(max_length=50)
+    genre = serializers.ListField(child=serializers.SlugField(max_length=50))
+
+    class Meta(CreateUpdateTitleSerializer.Meta):
+        validators = []
+        list_serializer_class = TitleBatchListSerializer
+
+    def validate_genre(self, value):
+        # Repeated slugs would break the unique genre link on insert.
+        return list(dict.fromkeys(value))
+
+
 class CurrentTitleDefault:
-    """Function receive title id from path parameter."""
+    """Function receive title from path parameter."""
 
     requires_context = True
 
     def __call__(self, serializer_field):
-        context = serializer_field.context['request'].parser_context
-        return get_object_or_404(
-            Title, id=context.get('kwargs').get('title_id'))
+        return get_title(serializer_field.context['request'])
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -95,31 +302,109 @@ class ReviewSerializer(serializers.ModelSerializer):
     title = serializers.HiddenField(default=CurrentTitleDefault())
 
     class Meta:
-        fields = '__all__'
+        exclude = ('modified',)
         model = Review
 
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Review.objects.all(),
-                fields=('author', 'title')
-            )
-        ]
-
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
-        return Review.objects.create(**validated_data)
+        # The unique constraint replaces a UniqueTogetherValidator,
+        # which costs a query on every successful create.
+        try:
+            return Review.objects.create(**validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'The fields author, title must make a unique set.']
+            })
+
+
+class ReviewBatchListSerializer(BatchListSerializer):
+    """Validate a list of imported reviews as a set and insert it in bulk."""
+
+    def validate_items(self, items, errors):
+        titles = set(Title.objects.filter(
+            pk__in={item['title_id'] for item in items}
+        ).values_list('pk', flat=True))
+        authors = User.objects.in_bulk(
+            {item['author']['username'] for item in items},
+            field_name='username'
+        )
+        existing = set(Review.objects.filter(
+            title__in=titles, author__in=authors.values()
+        ).values_list('title_id', 'author__username'))
+        for item, error in zip(items, errors):
+            username = item['author']['username']
+            key = (item['title_id'], username)
+            if item['title_id'] not in titles:
+                error['title'] = [
+                    f'Invalid pk "{item["title_id"]}" - '
+                    f'object does not exist.'
+                ]
+            if username not in authors:
+                error['author'] = [
+                    f'Object with username={username} does not exist.']
+            if key in existing:
+                error['non_field_errors'] = [
+                    'The fields author, title must make a unique set.']
+            existing.add(key)
+            if not error:
+                item['author'] = authors[username]
+
+    def create(self, validated_data):
+        reviews = Review.objects.bulk_create(
+            Review(**item) for item in validated_data)
+        if reviews and reviews[0].pk is None:
+            # Only some databases return primary keys of bulk inserts.
+            ids = {
+                (title_id, author_id): pk
+                for pk, title_id, author_id in Review.objects.filter(
+                    title__in={review.title_id for review in reviews},
+                    author__in={review.author_id for review in reviews}
+                ).values_list('pk', 'title_id', 'author_id')
+            }
+            for review in reviews:
+                review.pk = ids[(review.title_id, review.author_id)]
+        # pub_date is auto_now_add, so the insert stamps the current time
+        # and imported dates are written with one UPDATE afterwards.
+        dates = {
+            review.pk: item['pub_date']
+            for review, item in zip(reviews, validated_data)
+            if item.get('pub_date') is not None
+        }
+        if dates:
+            Review.objects.filter(pk__in=dates).update(pub_date=Case(
+                *(When(pk=pk, then=Value(date))
+                  for pk, date in dates.items()),
+                output_field=DateTimeField()
+            ))
+            for review in reviews:
+                review.pub_date = dates.get(review.pk, review.pub_date)
+        rebuild_ratings(Title.objects.filter(
+            pk__in={review.title_id for review in reviews}))
+        return reviews
+
+
+class ReviewBatchSerializer(serializers.ModelSerializer):
+    """A serializer for one review of an import batch."""
+
+    title = serializers.IntegerField(source='title_id')
+    author = serializers.CharField(source='author.username', max_length=150)
+    pub_date = serializers.DateTimeField(required=False)
+
+    class Meta:
+        fields = ('id', 'title', 'author', 'text', 'score', 'pub_date')
+        model = Review
+        validators = []
+        list_serializer_class = ReviewBatchListSerializer
 
 
 class CurrentReviewDefault:
-    """Function receive review id from path parameter."""
+    """Function receive review from path parameter."""
 
     requires_context = True
 
     def __call__(self, serializer_field):
-        context = serializer_field.context['request'].parser_context
-        return get_object_or_404(
-            Review, title__id=context.get('kwargs').get('title_id'),
-            id=context.get('kwargs').get('review_id'))
+        return get_review(serializer_field.context['request'])
 
 
 class CommentSerializer(serializers.ModelSerializer):
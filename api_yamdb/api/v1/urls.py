@@ -3,9 +3,9 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet, MeView,
-                    NewTokenView, ReviewViewSet, SignUpView, TitleViewSet,
-                    UserViewSet)
+from .views import (CategoryViewSet, CommentViewSet, GenreViewSet, MetricsView,
+                    MeView, NewTokenView, ReviewBatchView, ReviewViewSet,
+                    SignUpView, TitleViewSet, UserViewSet)
 
 router_v1 = routers.DefaultRouter()
 router_v1.register('categories', CategoryViewSet)
@@ -19,8 +19,10 @@ router_v1.register(
     CommentViewSet, basename='comments')
 
 urlpatterns = [
-    path('auth/signup/', SignUpView.as_view()),
-    path('auth/token/', NewTokenView.as_view()),
-    path('users/me/', MeView.as_view()),
+    path('auth/signup/', SignUpView.as_view(), name='signup'),
+    path('auth/token/', NewTokenView.as_view(), name='token'),
+    path('users/me/', MeView.as_view(), name='me'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('reviews/batch/', ReviewBatchView.as_view(), name='review-batch'),
     path('', include(router_v1.urls)),
 ]
@@ -1,29 +1,53 @@
 """Views in API app."""
 
+from api import metrics, replicas
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (filters, generics, mixins, permissions, status,
-                            viewsets)
+                            views, viewsets)
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.export import CONTENT_TYPES, export_lines
+from reviews.models import Category, Comment, Genre, Review, Title
+from users import outbox
 
+from .cache import bump_version, get_stamp, title_resource
 from .filters import TitleFilter
+from .mixins import CatalogCacheMixin, ConditionalGetMixin, SparseFieldsetMixin
+from .pagination import (CommentCursorPagination, CursorPaginationMixin,
+                         ReviewCursorPagination, TopTitleCursorPagination,
+                         TrendingTitleCursorPagination)
 from .permissions import (IsAdmin, IsAdminOrReadOnly,
                           IsOwnerAdminModeratorOrReadOnly)
+from .renderers import PrometheusRenderer
+from .resolvers import get_review, get_title
 from .serializers import (CategorySerializer, CommentSerializer,
                           CreateUpdateTitleSerializer, GenreSerializer,
-                          MeSerializer, NewTokenSerializer, ReviewSerializer,
-                          SignUpSerializer, TitleSerializer, UserSerializer)
+                          MeSerializer, NewTokenSerializer,
+                          ReviewBatchSerializer, ReviewSerializer,
+                          SignUpSerializer, TitleBatchSerializer,
+                          TitleRankingSerializer, TitleSerializer,
+                          UserSerializer)
 
 User = get_user_model()
 
 
+def create_batch(serializer):
+    """Validate and insert a batch in one transaction."""
+    with transaction.atomic():
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+    # Bulk inserts skip the signals that invalidate the catalog cache.
+    bump_version('titles')
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class GetPatchView(generics.UpdateAPIView, generics.RetrieveAPIView):
     """Get+Patch mix View."""
 
@@ -35,7 +59,7 @@ class CreateDestroyListViewSet(mixins.CreateModelMixin,
     """Create+Destroy+list mix ViewSet."""
 
 
-class CategoryViewSet(CreateDestroyListViewSet):
+class CategoryViewSet(CatalogCacheMixin, CreateDestroyListViewSet):
     """A viewset for viewing and editing Category instances."""
 
     queryset = Category.objects.all()
@@ -44,9 +68,10 @@ class CategoryViewSet(CreateDestroyListViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_resource = 'categories'
 
 
-class GenreViewSet(CreateDestroyListViewSet):
+class GenreViewSet(CatalogCacheMixin, CreateDestroyListViewSet):
     """A viewset for viewing and editing Genre instances."""
 
     queryset = Genre.objects.all()
@@ -55,48 +80,167 @@ class GenreViewSet(CreateDestroyListViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_resource = 'genres'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, CatalogCacheMixin,
+                   SparseFieldsetMixin, viewsets.ModelViewSet):
     """A viewset for viewing and editing Title instances."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('name')
+    queryset = (
+        Title.objects.select_related('category')
+        .prefetch_related('genre').order_by('name')
+    )
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (IsAdminOrReadOnly,)
+    cache_resource = 'titles'
+    cached_actions = ('list', 'retrieve', 'top', 'trending')
+    sparse_columns = {
+        'rating': ('rating_sum', 'rating_count'),
+        'category': ('category__name', 'category__slug'),
+        'genre': (),
+    }
+    sparse_select_related = {'category': 'category'}
+    sparse_prefetch_related = {'genre': 'genre'}
 
     def get_serializer_class(self):
         if self.action in ('create', 'partial_update'):
             return CreateUpdateTitleSerializer
+        if self.action == 'batch':
+            return TitleBatchSerializer
+        if self.action in ('top', 'trending'):
+            return TitleRankingSerializer
         return TitleSerializer
 
+    def get_cache_resources(self):
+        if self.action in ('top', 'trending'):
+            return (self.cache_resource, 'rankings')
+        if self.action == 'retrieve':
+            try:
+                pk = int(self.kwargs[self.lookup_field])
+            except ValueError:
+                return (self.cache_resource,)
+            return (self.cache_resource, title_resource(pk))
+        return (self.cache_resource,)
+
+    def get_validators(self):
+        return get_stamp(self.get_cache_resources()), None
+
+    def perform_destroy(self, instance):
+        # Reviews and comments are removed by the purgedeleted worker.
+        instance.mark_deleted()
+
+    @action(detail=False, pagination_class=TopTitleCursorPagination)
+    def top(self, request):
+        """List rated titles by their Bayesian weighted rating."""
+        return self.ranking(self.get_queryset().filter(rating_count__gt=0))
+
+    @action(detail=False, pagination_class=TrendingTitleCursorPagination)
+    def trending(self, request):
+        """List titles by the reviews they got in the trending window."""
+        return self.ranking(
+            self.get_queryset().filter(recent_reviews__gt=0))
+
+    def ranking(self, queryset):
+        # The cursor pagination orders the page by the stored ranking.
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, permission_classes=(IsAdmin,))
+    def export(self, request):
+        """Stream all filtered titles as NDJSON or CSV."""
+        file_format = request.query_params.get('file_format', 'ndjson')
+        if file_format not in CONTENT_TYPES:
+            return Response(
+                {'file_format': list(CONTENT_TYPES)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # The body is read after ReplicaMiddleware returned.
+        queryset = self.filter_queryset(
+            Title.objects.using(replicas.read_alias()))
+        response = StreamingHttpResponse(
+            export_lines(file_format, queryset),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{file_format}"')
+        return response
+
+    @action(detail=False, methods=('post',), permission_classes=(IsAdmin,))
+    def batch(self, request):
+        """Create a list of titles at once."""
+        return create_batch(self.get_serializer(data=request.data, many=True))
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(ConditionalGetMixin, CursorPaginationMixin,
+                    SparseFieldsetMixin, viewsets.ModelViewSet):
     """A viewset for Reviews."""
 
     serializer_class = ReviewSerializer
+    cursor_pagination_class = ReviewCursorPagination
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsOwnerAdminModeratorOrReadOnly)
+    sparse_columns = {'author': ('author__username',)}
+    sparse_select_related = {'author': 'author'}
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        if self.detail:
+            # get_object() answers 404 for reviews of other titles.
+            reviews = Review.objects.filter(
+                title_id=self.kwargs['title_id'],
+                title__deleted__isnull=True)
+        else:
+            # Not title.reviews, which reads title_id of every review to
+            # attach the title, defeating sparse fieldsets.
+            reviews = Review.objects.filter(title=get_title(self.request))
+        # Reviews of deleted users stay until the purge, but unseen.
+        return reviews.filter(
+            author__deleted__isnull=True).select_related('author')
+
+    def get_validators(self):
+        modified = get_title(self.request).modified
+        return modified, modified
+
+
+class CommentViewSet(ConditionalGetMixin, CursorPaginationMixin,
+                     SparseFieldsetMixin, viewsets.ModelViewSet):
     """A viewset for Comments."""
 
     serializer_class = CommentSerializer
+    cursor_pagination_class = CommentCursorPagination
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsOwnerAdminModeratorOrReadOnly)
+    sparse_columns = {'author': ('author__username',)}
+    sparse_select_related = {'author': 'author'}
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        title_id = self.kwargs.get('title_id')
-        review = get_object_or_404(Review, title__id=title_id, id=review_id)
-        return review.comments.all()
+        if self.detail:
+            comments = Comment.objects.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id'],
+                review__title__deleted__isnull=True,
+                review__author__deleted__isnull=True)
+        else:
+            comments = Comment.objects.filter(
+                review=get_review(self.request))
+        return comments.filter(
+            author__deleted__isnull=True).select_related('author')
+
+    def get_validators(self):
+        modified = get_review(self.request).modified
+        return modified, modified
+
+
+class ReviewBatchView(generics.GenericAPIView):
+    """Import a list of reviews of any titles and authors at once."""
+
+    serializer_class = ReviewBatchSerializer
+    permission_classes = (IsAdmin,)
+
+    def post(self, request):
+        return create_batch(self.get_serializer(data=request.data, many=True))
 
 
 class SignUpView(generics.CreateAPIView):
@@ -106,13 +250,12 @@ class SignUpView(generics.CreateAPIView):
     serializer_class = SignUpSerializer
 
     def send_code(self, code, email):
-        """Send email with confirmation_code."""
-        send_mail(
+        """Queue email with confirmation_code."""
+        outbox.enqueue(
             'code',
             f'confirmation_code = {code}',
             'admin@yamdb.ru',
-            [email],
-            fail_silently=False,
+            email,
         )
 
     def post(self, request):
@@ -130,6 +273,7 @@ class SignUpView(generics.CreateAPIView):
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         username = serializer.validated_data.get('username')
         email = serializer.validated_data.get('email')
@@ -173,6 +317,10 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ('username',)
     http_method_names = ('get', 'post', 'list', 'delete', 'patch')
 
+    def perform_destroy(self, instance):
+        # Reviews and comments are removed by the purgedeleted worker.
+        instance.mark_deleted()
+
 
 class MeView(GetPatchView):
     """View for /me."""
@@ -191,3 +339,13 @@ class MeView(GetPatchView):
         serializer.update(request.user, serializer.validated_data)
         resp = MeSerializer(request.user).data
         return Response(resp, status=status.HTTP_200_OK)
+
+
+class MetricsView(views.APIView):
+    """Request metrics of all worker processes for Prometheus."""
+
+    permission_classes = (IsAdmin,)
+    renderer_classes = (PrometheusRenderer,)
+
+    def get(self, request):
+        return Response(metrics.render())
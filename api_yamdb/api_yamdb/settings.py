@@ -28,6 +28,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so storing slow queries is not part of Server-Timing.
+    'api.middleware.SlowQueryMiddleware',
+    'api.middleware.ServerTimingMiddleware',
+    'api.middleware.ReplicaMiddleware',
+    'api.middleware.CacheVersionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,8 +75,42 @@ DATABASES = {
     }
 }
 
+# Comma separated hosts of read replicas of the default database.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+        filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(',')),
+        start=1):
+    DATABASES[f'replica{number}'] = dict(
+        DATABASES['default'], HOST=host.strip(), TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(
+    os.getenv('REPLICA_STICKY_SECONDS', default=10))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+    }
+}
+
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', default=300))
+# Seconds a process keeps its category and genre snapshot, see
+# api/v1/registry.py.
+REGISTRY_TIMEOUT = int(os.getenv('REGISTRY_TIMEOUT', default=60))
+
 AUTH_USER_MODEL = 'users.User'
 
+# Bayesian prior of /titles/top/: every title starts with
+# RATING_PRIOR_WEIGHT votes of RATING_PRIOR_MEAN.
+RATING_PRIOR_MEAN = float(os.getenv('RATING_PRIOR_MEAN', default=5))
+RATING_PRIOR_WEIGHT = int(os.getenv('RATING_PRIOR_WEIGHT', default=10))
+# /titles/trending/ ranks titles by reviews of the last days.
+TRENDING_WINDOW_DAYS = int(os.getenv('TRENDING_WINDOW_DAYS', default=7))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -102,20 +141,61 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
+# Pre-rendered catalog pages served by nginx, see snapshotcatalog.
+SNAPSHOT_ROOT = os.path.join(STATIC_ROOT, 'snapshots')
+SNAPSHOT_BASE_URL = os.getenv(
+    'SNAPSHOT_BASE_URL', default='http://127.0.0.1')
+SNAPSHOT_PAGES = int(os.getenv('SNAPSHOT_PAGES', default=5))
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# FAST_JSON=true switches to the orjson based renderer and parser.
+if os.getenv('FAST_JSON', default='') == 'true':
+    JSON_RENDERER = 'api.v1.renderers.ORJSONRenderer'
+    JSON_PARSER = 'api.v1.parsers.ORJSONParser'
+else:
+    JSON_RENDERER = 'rest_framework.renderers.JSONRenderer'
+    JSON_PARSER = 'rest_framework.parsers.JSONParser'
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        JSON_RENDERER,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        JSON_PARSER,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
 }
 
+BATCH_MAX_SIZE = 10000
+# Batch requests of BATCH_MAX_SIZE items are bigger than the default.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 20 * 1024 * 1024
+
+# Admin changelists count at most this many rows, see api/admin.py.
+ADMIN_COUNT_LIMIT = int(os.getenv('ADMIN_COUNT_LIMIT', default=10000))
+
+AUTH_USER_CACHE_SIZE = 10000
+# Cached users are checked against stamps in the default cache, see
+# users/authentication.py. A process-local cache misses changes made in
+# other workers, so users are only cached when the cache is shared.
+AUTH_USER_CACHE_TTL = int(os.getenv(
+    'AUTH_USER_CACHE_TTL',
+    default=0 if CACHES['default']['BACKEND'] in (
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.dummy.DummyCache',
+    ) else 60))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -123,3 +203,37 @@ SIMPLE_JWT = {
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+EMAIL_OUTBOX_SEND_ON_COMMIT = (
+    os.getenv('EMAIL_OUTBOX_SEND_ON_COMMIT', default='') == 'true')
+
+SLOW_QUERY_CAPTURE = os.getenv('SLOW_QUERY_CAPTURE', default='') == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.getenv('SLOW_QUERY_THRESHOLD_MS', default=100))
+SLOW_QUERY_SAMPLE_RATE = float(
+    os.getenv('SLOW_QUERY_SAMPLE_RATE', default=0.1))
+SLOW_QUERY_LIMIT = 10
+SLOW_QUERY_EXPLAIN_ANALYZE = (
+    os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE', default='') == 'true')
+SLOW_QUERY_LOG_FILE = os.getenv(
+    'SLOW_QUERY_LOG_FILE', default=os.path.join(BASE_DIR, 'slow_queries.log'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'api.slowqueries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,62 @@
+"""Gunicorn settings of the web container.
+
+Every value can be overridden with the GUNICORN_* variable next to it,
+infra/loadtest/run.py compares worker profiles that way. Gunicorn also
+applies GUNICORN_CMD_ARGS on top of this file.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default=default))
+
+
+bind = os.getenv('GUNICORN_BIND', default='0.0.0.0:8000')
+# 2 * CPU + 1 keeps every core busy while some workers wait on the
+# database.
+workers = env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', default='gthread')
+threads = env_int('GUNICORN_THREADS', 4)
+# Workers fork from a master that already imported Django, which
+# saves memory and startup time.
+preload_app = os.getenv('GUNICORN_PRELOAD', default='true') == 'true'
+# Recycle workers to cap slow memory growth, the jitter keeps them
+# from restarting all at once.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+# The worker heartbeat file is touched on every request; on the
+# overlay filesystem of a container that can block a worker.
+worker_tmp_dir = os.getenv(
+    'GUNICORN_WORKER_TMP_DIR',
+    default='/dev/shm' if os.path.isdir('/dev/shm') else None)
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = os.getenv('GUNICORN_ERROR_LOG', default='-')
+# Workers write their request metrics to files in this directory and a
+# scrape of any worker sums them, see api/metrics.py. prometheus_client
+# reads the variable on import, before the app is preloaded.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(
+        '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+        'yamdb-metrics'))
+
+
+def on_starting(server):
+    # Files of a previous run would be added to the new series.
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.unlink(path)
+
+
+def when_ready(server):
+    # Runs in the master before workers fork: a connection opened while
+    # preloading would otherwise be shared by all of them.
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
@@ -1,10 +1,63 @@
+from api.admin import ScalableModelAdmin
 from django.contrib import admin
 
 from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .search import search_titles
 
-admin.site.register(Category)
-admin.site.register(Genre)
-admin.site.register(Title)
-admin.site.register(GenreTitle)
-admin.site.register(Review)
-admin.site.register(Comment)
+
+@admin.register(Category, Genre)
+class ReferenceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
+    prepopulated_fields = {'slug': ('name',)}
+
+
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    autocomplete_fields = ('genre',)
+    extra = 1
+
+
+@admin.register(Title)
+class TitleAdmin(ScalableModelAdmin):
+    list_display = ('name', 'year', 'category', 'rating_count')
+    list_select_related = ('category',)
+    list_filter = ('category',)
+    search_fields = ('name',)
+    autocomplete_fields = ('category',)
+    inlines = (GenreTitleInline,)
+    readonly_fields = (
+        'rating_sum', 'rating_count', 'weighted_rating', 'recent_reviews')
+
+    def get_search_results(self, request, queryset, search_term):
+        # The full-text index instead of LIKE '%term%'.
+        if not search_term:
+            return queryset, False
+        return search_titles(queryset, search_term), False
+
+
+@admin.register(GenreTitle)
+class GenreTitleAdmin(ScalableModelAdmin):
+    list_display = ('title', 'genre')
+    list_select_related = ('title', 'genre')
+    raw_id_fields = ('title',)
+    autocomplete_fields = ('genre',)
+    exact_search_fields = ('title',)
+
+
+@admin.register(Review)
+class ReviewAdmin(ScalableModelAdmin):
+    list_display = ('id', 'title', 'author', 'score', 'pub_date')
+    list_select_related = ('title', 'author')
+    raw_id_fields = ('title', 'author')
+    exact_search_fields = ('id', 'title', 'author__username')
+    date_hierarchy = 'pub_date'
+
+
+@admin.register(Comment)
+class CommentAdmin(ScalableModelAdmin):
+    list_display = ('id', 'review', 'author', 'pub_date')
+    list_select_related = ('review', 'author')
+    raw_id_fields = ('review', 'author')
+    exact_search_fields = ('id', 'review', 'author__username')
+    date_hierarchy = 'pub_date'
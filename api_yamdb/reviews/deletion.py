@@ -0,0 +1,106 @@
+"""Background removal of soft-deleted titles and users.
+
+Deleting a title or a user through the API only stamps its deleted
+column, which hides it from the default managers at once. Its reviews
+and comments are removed here in small transactions, so no request
+waits for the cascade and no lock is held for long. The purgedeleted
+command runs purge_deleted() until nothing is left.
+
+While a chunk is deleted, purging is set and the per-row receivers of
+reviews and comments and the catalog cache receiver step aside. Each
+chunk then moves the stamps, rebuilds the ratings of the touched titles
+and bumps the cache version once. Soft-deleted titles are skipped by
+rebuild_ratings(), since it goes through Title.objects.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from api.v1.cache import bump_on_commit
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comment, Review, Title
+from .ratings import rebuild_ratings
+
+User = get_user_model()
+
+purging = ContextVar('purging', default=False)
+
+
+@contextmanager
+def receivers_muted():
+    token = purging.set(True)
+    try:
+        yield
+    finally:
+        purging.reset(token)
+
+
+@contextmanager
+def comments_removed(rows):
+    """Move the stamps of the reviews that lose comments."""
+    reviews = set(rows.values_list('review', flat=True))
+    with receivers_muted():
+        yield
+    Review.objects.filter(pk__in=reviews).update(modified=timezone.now())
+
+
+@contextmanager
+def reviews_removed(rows):
+    """Rebuild the totals of the titles that lose reviews."""
+    titles = set(rows.values_list('title', flat=True))
+    with receivers_muted():
+        yield
+    rebuild_ratings(Title.objects.filter(pk__in=titles))
+    bump_on_commit('titles')
+
+
+@contextmanager
+def titles_removed(rows):
+    """Drop the cached catalog once for the removed tombstones."""
+    with receivers_muted():
+        yield
+    bump_on_commit('titles')
+
+
+CHUNK_HANDLERS = {
+    Comment: comments_removed,
+    Review: reviews_removed,
+    Title: titles_removed,
+}
+
+
+def delete_chunk(queryset, chunk_size):
+    """Delete up to chunk_size rows of the queryset, return their number."""
+    ids = list(
+        queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+    if ids:
+        rows = queryset.model._base_manager.filter(pk__in=ids)
+        handler = CHUNK_HANDLERS.get(queryset.model, nullcontext)
+        with transaction.atomic(), handler(rows):
+            rows.delete()
+    return len(ids)
+
+
+def purge_deleted(chunk_size=500):
+    """Delete one chunk of the rows left by soft-deleted titles and users.
+
+    Comments go first and reviews next, so every cascade of a chunk is
+    bounded. Tombstones are deleted once only their genre links and
+    trending activity are left. Return the number of rows deleted,
+    zero when nothing is pending.
+    """
+    titles = Title.all_objects.filter(deleted__isnull=False)
+    users = User.all_objects.filter(deleted__isnull=False)
+    for queryset in (
+        Comment.objects.filter(review__title__in=titles),
+        Comment.objects.filter(review__author__in=users),
+        Comment.objects.filter(author__in=users),
+        Review.objects.filter(title__in=titles),
+        Review.objects.filter(author__in=users),
+    ):
+        deleted = delete_chunk(queryset, chunk_size)
+        if deleted:
+            return deleted
+    return delete_chunk(titles, chunk_size) + delete_chunk(users, chunk_size)
@@ -0,0 +1,72 @@
+"""Streaming export of the title catalog.
+
+Titles are read with a server-side cursor and genres are fetched per
+chunk, so memory use does not depend on the catalog size.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from .models import GenreTitle, Title
+
+FIELDS = ('id', 'name', 'year', 'description', 'category', 'genre', 'rating')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def iter_titles(queryset=None, chunk_size=2000):
+    """Yield titles as dicts with category, genre slugs and rating."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    titles = queryset.order_by('pk').values_list(
+        'id', 'name', 'year', 'description', 'category__slug',
+        'rating_sum', 'rating_count'
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(titles, chunk_size))
+        if not chunk:
+            return
+        genres = {}
+        for title_id, slug in GenreTitle.objects.using(queryset.db).filter(
+            title_id__in=[title[0] for title in chunk]
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug'):
+            genres.setdefault(title_id, []).append(slug)
+        for (title_id, name, year, description, category,
+             rating_sum, rating_count) in chunk:
+            yield {
+                'id': title_id,
+                'name': name,
+                'year': year,
+                'description': description,
+                'category': category,
+                'genre': genres.get(title_id, []),
+                'rating': (
+                    round(rating_sum / rating_count, 2)
+                    if rating_count else None
+                ),
+            }
+
+
+def ndjson_lines(titles):
+    for title in titles:
+        yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+def csv_lines(titles):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, FIELDS)
+    writer.writeheader()
+    for title in titles:
+        writer.writerow({**title, 'genre': ','.join(title['genre'])})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def export_lines(file_format, queryset=None, chunk_size=2000):
+    """Return an iterator of text lines in the requested format."""
+    writers = {'ndjson': ndjson_lines, 'csv': csv_lines}
+    return writers[file_format](iter_titles(queryset, chunk_size))
@@ -0,0 +1,30 @@
+import time
+
+from api.v1.cache import bump_version
+from django.core.management.base import BaseCommand
+from reviews.ratings import expire_activity
+
+
+class Command(BaseCommand):
+    help = 'Use this command to move the trending window to the current day'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep moving the window instead of moving it once.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=600,
+            help='Seconds between two checks.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_activity()
+            if expired:
+                bump_version('rankings')
+                self.stdout.write(
+                    f'Trending counters of {expired} titles expired')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from reviews.export import CONTENT_TYPES, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Use this command to export titles with genres and rating'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', dest='file_format', choices=CONTENT_TYPES,
+            default='ndjson'
+        )
+        parser.add_argument(
+            '--output', help='File to write, stdout by default.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        lines = export_lines(options['file_format'],
+                             chunk_size=options['chunk_size'])
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf8',
+                  newline='') as file:
+            file.writelines(lines)
@@ -1,10 +1,18 @@
+import io
 import logging
+import os
 import sys
+import time
 from csv import DictReader
+from itertools import islice
 
+from api.v1.cache import bump_version
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import rebuild_ratings
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -18,35 +26,148 @@ handler.setFormatter(formatter)
 User = get_user_model()
 
 DATAPATH = {
-    Category: 'static/data/category.csv',
-    Genre: 'static/data/genre.csv',
-    Title: 'static/data/titles.csv',
-    Title.genre.through: 'static/data/genre_title.csv',
-    User: 'static/data/users.csv',
-    Review: 'static/data/review.csv',
-    Comment: 'static/data/comments.csv',
+    Category: 'category.csv',
+    Genre: 'genre.csv',
+    Title: 'titles.csv',
+    Title.genre.through: 'genre_title.csv',
+    User: 'users.csv',
+    Review: 'review.csv',
+    Comment: 'comments.csv',
 }
 
 
+def copy_value(value):
+    """Format a value for COPY text format."""
+    if value is None:
+        return '\\N'
+    return (
+        str(value).replace('\\', '\\\\').replace('\t', '\\t')
+        .replace('\n', '\\n').replace('\r', '\\r')
+    )
+
+
+class Loader:
+    """Insert CSV rows of one model, skipping rows that already exist."""
+
+    def __init__(self, model, header):
+        self.model = model
+        self.table = connection.ops.quote_name(model._meta.db_table)
+        # CSV columns name fields either by name or by attname.
+        self.fields = [model._meta.get_field(name) for name in header]
+        instance = model()
+        self.defaults = [
+            (field, field.get_db_prep_save(
+                field.pre_save(instance, True), connection))
+            for field in model._meta.concrete_fields
+            if field not in self.fields and not field.primary_key
+        ]
+        self.columns = ', '.join(
+            connection.ops.quote_name(field.column)
+            for field in self.fields + [field for field, _ in self.defaults]
+        )
+
+    def prepare(self, row):
+        return [
+            field.get_db_prep_save(
+                None if value == '' and field.null
+                else field.to_python(value),
+                connection
+            )
+            for field, value in zip(self.fields, row.values())
+        ] + [value for _, value in self.defaults]
+
+    def load(self, rows):
+        """Insert the rows and return how many were not there yet."""
+        rows = [self.prepare(row) for row in rows]
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                self.copy(cursor, rows)
+            else:
+                self.insert(cursor, rows)
+            # Skipped conflicting rows are not counted.
+            return cursor.rowcount
+
+    def insert(self, cursor, rows):
+        placeholders = ', '.join(['%s'] * len(rows[0]))
+        cursor.executemany(
+            f'{connection.ops.insert_statement(ignore_conflicts=True)} '
+            f'{self.table} ({self.columns}) VALUES ({placeholders}) '
+            f'{connection.ops.ignore_conflicts_suffix_sql(True)}',
+            rows
+        )
+
+    def copy(self, cursor, rows):
+        # COPY cannot skip conflicting rows, so it fills a staging
+        # table that is merged with ON CONFLICT DO NOTHING.
+        cursor.execute(
+            f'CREATE TEMP TABLE filldatabase_staging ON COMMIT DROP AS '
+            f'SELECT {self.columns} FROM {self.table} WITH NO DATA'
+        )
+        data = io.StringIO(''.join(
+            '\t'.join(copy_value(value) for value in row) + '\n'
+            for row in rows
+        ))
+        cursor.copy_expert(
+            f'COPY filldatabase_staging ({self.columns}) FROM STDIN', data)
+        cursor.execute(
+            f'INSERT INTO {self.table} ({self.columns}) '
+            f'SELECT {self.columns} FROM filldatabase_staging '
+            f'ON CONFLICT DO NOTHING'
+        )
+
+
 class Command(BaseCommand):
     help = 'Use this command to fill the database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Rows inserted per transaction.'
+        )
+        parser.add_argument(
+            '--data-dir', default='static/data',
+            help='Directory with the CSV files.'
+        )
+
     def handle(self, *args, **options):
-        for model in DATAPATH:
+        for model, filename in DATAPATH.items():
             logger.debug(f'Start {model.__name__} data transfer')
             try:
-                objs = [
-                    model.objects.create(**obj)
-                    for obj in DictReader(
-                        open(DATAPATH[model], encoding='utf8')
-                    )
-                ]
-                model.objects.bulk_create(objs=objs, ignore_conflicts=True)
+                read, inserted = self.load_file(
+                    model, os.path.join(options['data_dir'], filename),
+                    options['batch_size']
+                )
                 logger.debug(
-                    f'Data successfully loaded into {model.__name__}\n'
+                    f'{model.__name__}: {inserted} rows inserted, '
+                    f'{read - inserted} already loaded rows skipped\n'
                 )
             except Exception:
                 logger.error(
                     f'We have a problem with data or {model.__name__} model\n',
                     exc_info=True
                 )
+        # Bulk inserts skip signals, so derived data is refreshed here.
+        rebuild_ratings()
+        bump_version('categories', 'genres', 'titles')
+
+    def load_file(self, model, path, batch_size):
+        """Return the numbers of rows read and inserted."""
+        started = time.monotonic()
+        read = inserted = 0
+        with open(path, encoding='utf8', newline='') as file:
+            reader = DictReader(file)
+            loader = Loader(model, reader.fieldnames)
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    break
+                inserted += loader.load(rows)
+                read += len(rows)
+                rate = read / max(time.monotonic() - started, 1e-6)
+                logger.debug(
+                    f'{model.__name__}: {read} rows read, {inserted} '
+                    f'inserted, {rate:.0f} rows/s')
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+        return read, inserted
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from reviews.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    help = 'Use this command to remove soft-deleted titles and users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Rows deleted per transaction.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for deleted rows instead of draining once.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait when nothing is left to delete.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            total = 0
+            while True:
+                deleted = purge_deleted(options['chunk_size'])
+                if not deleted:
+                    break
+                total += deleted
+            if total:
+                self.stdout.write(f'Purged {total} rows')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
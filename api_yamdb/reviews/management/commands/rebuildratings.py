@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Use this command to rebuild stored title ratings from reviews'
+
+    def handle(self, *args, **options):
+        updated = rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Ratings rebuilt for {updated} titles')
+        )
@@ -0,0 +1,25 @@
+from api.v1.cache import bump_version
+from django.core.management.base import BaseCommand
+from reviews.seed import seed_catalog
+
+
+class Command(BaseCommand):
+    help = 'Use this command to fill an empty database with generated data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--genres-per-title', type=int, default=2)
+        parser.add_argument('--reviews-per-title', type=int, default=10)
+        parser.add_argument('--comments-per-review', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        seed_catalog(
+            titles=options['titles'],
+            genres_per_title=options['genres_per_title'],
+            reviews_per_title=options['reviews_per_title'],
+            comments_per_review=options['comments_per_review'],
+            batch_size=options['batch_size'],
+        )
+        bump_version('categories', 'genres', 'titles')
+        self.stdout.write(self.style.SUCCESS('Catalog seeded'))
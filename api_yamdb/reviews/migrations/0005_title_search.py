@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    # SQLite keeps its FTS5 table in sync with triggers that are
+    # installed by a post_migrate receiver of the reviews app.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS reviews_title_name_tsv_idx '
+        "ON reviews_title USING gin (to_tsvector('simple', name))"
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS reviews_title_name_trgm_idx '
+        'ON reviews_title USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS reviews_title_name_tsv_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS reviews_title_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_pub_date_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
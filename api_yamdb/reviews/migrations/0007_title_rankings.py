@@ -0,0 +1,102 @@
+# Generated by Django 3.2 on 2026-10-18 20:10
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_rankings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    TitleActivity = apps.get_model('reviews', 'TitleActivity')
+    weight = settings.RATING_PRIOR_WEIGHT
+    Title.objects.filter(rating_count__gt=0).update(weighted_rating=(
+        Cast(F('rating_sum'), FloatField())
+        + weight * settings.RATING_PRIOR_MEAN
+    ) / Cast(F('rating_count') + weight, FloatField()))
+    start = timezone.localdate() - timedelta(
+        days=settings.TRENDING_WINDOW_DAYS - 1)
+    days = (
+        Review.objects
+        .filter(pub_date__gte=timezone.make_aware(
+            datetime.combine(start, time.min)))
+        .annotate(day=TruncDate('pub_date')).order_by()
+        .values_list('title', 'day').annotate(total=Count('pk'))
+    )
+    TitleActivity.objects.bulk_create(
+        (
+            TitleActivity(title_id=title_id, day=day, reviews=total)
+            for title_id, day, total in days.iterator()
+        ),
+        batch_size=1000
+    )
+    activity = (
+        TitleActivity.objects.filter(title=OuterRef('pk'))
+        .order_by().values('title')
+    )
+    Title.objects.update(recent_reviews=Coalesce(
+        Subquery(activity.annotate(total=Sum('reviews')).values('total')), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_modification_dates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True, verbose_name='day')),
+                ('reviews', models.PositiveIntegerField(default=0, verbose_name='reviews')),
+            ],
+            options={
+                'verbose_name': 'title activity',
+                'verbose_name_plural': 'title activity',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='recent_reviews',
+            field=models.PositiveIntegerField(default=0, verbose_name='reviews in the trending window'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=0, verbose_name='weighted rating'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating', '-id'], name='reviews_tit_weighte_6ac0c2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-weighted_rating', '-id'], name='reviews_tit_categor_e9b5ac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-recent_reviews', '-id'], name='reviews_tit_recent__5e266f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-recent_reviews', '-id'], name='reviews_tit_categor_fc292e_idx'),
+        ),
+        migrations.AddField(
+            model_name='titleactivity',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='reviews.title', verbose_name='title'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleactivity',
+            constraint=models.UniqueConstraint(fields=('title', 'day'), name='unique_title_activity'),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
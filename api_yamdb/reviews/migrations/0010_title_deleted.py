@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='title',
+            name='unique_title',
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='deleted',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletion date'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(deleted__isnull=False), fields=['deleted'], name='reviews_title_deleted_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='title',
+            constraint=models.UniqueConstraint(condition=models.Q(deleted__isnull=True), fields=('name', 'year', 'category'), name='unique_title'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_deleted'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ['pub_date', 'id'], 'verbose_name': 'comment', 'verbose_name_plural': 'comments'},
+        ),
+        migrations.AlterModelOptions(
+            name='review',
+            options={'ordering': ['-pub_date', '-id'], 'verbose_name': 'review', 'verbose_name_plural': 'reviews'},
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='reviews_com_review__eef424_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='reviews_rev_title_i_9d031e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'pub_date', 'id'], name='reviews_com_review__ec94f3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='reviews_rev_title_i_f9eada_idx'),
+        ),
+    ]
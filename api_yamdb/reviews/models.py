@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from reviews.validators import validate_year
 
 User = get_user_model()
@@ -32,6 +33,13 @@ class Genre(models.Model):
         return self.name
 
 
+class LiveManager(models.Manager):
+    """Manager that hides soft-deleted rows."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
 class Title(models.Model):
     name = models.CharField(max_length=256, verbose_name='name')
     year = models.SmallIntegerField(
@@ -48,14 +56,50 @@ class Title(models.Model):
     genre = models.ManyToManyField(
         Genre, through='GenreTitle', related_name='genre'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0, verbose_name='rating sum'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0, verbose_name='rating count'
+    )
+    modified = models.DateTimeField(
+        auto_now=True, verbose_name='modification date'
+    )
+    weighted_rating = models.FloatField(
+        default=0, verbose_name='weighted rating'
+    )
+    recent_reviews = models.PositiveIntegerField(
+        default=0, verbose_name='reviews in the trending window'
+    )
+    deleted = models.DateTimeField(
+        null=True, blank=True, verbose_name='deletion date'
+    )
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'title'
         verbose_name_plural = 'titles'
         ordering = ['name']
+        indexes = (
+            # Filters of the title list ordered by name.
+            models.Index(fields=('category', 'name')),
+            models.Index(fields=('year', 'name')),
+            models.Index(fields=('-weighted_rating', '-id')),
+            models.Index(fields=('category', '-weighted_rating', '-id')),
+            models.Index(fields=('-recent_reviews', '-id')),
+            models.Index(fields=('category', '-recent_reviews', '-id')),
+            models.Index(
+                fields=('deleted',),
+                condition=models.Q(deleted__isnull=False),
+                name='reviews_title_deleted_idx',
+            ),
+        )
         constraints = [
             models.UniqueConstraint(
                 fields=('name', 'year', 'category'),
+                condition=models.Q(deleted__isnull=True),
                 name='unique_title'
             )
         ]
@@ -63,12 +107,27 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    def mark_deleted(self):
+        """Hide the title, its rows are removed by purge_deleted()."""
+        self.deleted = timezone.now()
+        self.save(update_fields=('deleted',))
+
+    @property
+    def rating(self):
+        """Average review score built from the stored running totals."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
 
     class Meta:
+        # The constraint serves lookups by genre, this index the
+        # genres of a title.
+        indexes = (models.Index(fields=('title', 'genre')),)
         constraints = [
             models.UniqueConstraint(
                 fields=('genre', 'title'),
@@ -93,12 +152,18 @@ class Review(models.Model):
         verbose_name='score')
     pub_date = models.DateTimeField(
         verbose_name='publicaton date', auto_now_add=True)
+    modified = models.DateTimeField(
+        verbose_name='modification date', auto_now=True)
 
     class Meta:
         verbose_name = 'review'
         verbose_name_plural = 'reviews'
-        indexes = (models.Index(fields=('-pub_date',)),)
-        ordering = ['-pub_date']
+        indexes = (
+            models.Index(fields=('-pub_date',)),
+            models.Index(fields=('title', '-pub_date', '-id')),
+        )
+        # The id keeps reviews published at the same time in one order.
+        ordering = ['-pub_date', '-id']
 
         constraints = [
             models.UniqueConstraint(
@@ -108,6 +173,41 @@ class Review(models.Model):
     def __str__(self):
         return f'{self.id}: {self.text[:15]}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_rating = (
+            loaded.get('title_id'), loaded.get('score'))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Title rating totals are updated by a post_save receiver,
+        # keep them in the same transaction as the review row.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class TitleActivity(models.Model):
+    """Number of reviews a title got on one day of the trending window."""
+
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, related_name='activity',
+        verbose_name='title')
+    day = models.DateField(verbose_name='day', db_index=True)
+    reviews = models.PositiveIntegerField(default=0, verbose_name='reviews')
+
+    class Meta:
+        verbose_name = 'title activity'
+        verbose_name_plural = 'title activity'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'day'), name='unique_title_activity')
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.day} {self.reviews}'
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -123,7 +223,11 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'comment'
         verbose_name_plural = 'comments'
-        ordering = ['pub_date']
+        indexes = (
+            models.Index(fields=('review', 'pub_date', 'id')),
+            models.Index(fields=('pub_date',)),
+        )
+        ordering = ['pub_date', 'id']
 
     def __str__(self):
         return f'{self.id}: {self.text[:15]}'
@@ -0,0 +1,160 @@
+"""Running rating totals and trending counters stored on Title."""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import (Case, Count, F, FloatField, OuterRef, Subquery,
+                              Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce, TruncDate
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Review, Title, TitleActivity
+
+# Sent by apply_score() with title_id, previous and rating averages.
+score_applied = Signal()
+
+
+def weighted_rating(score=0, count=0):
+    """Return the Bayesian average of the totals moved by the deltas.
+
+    Titles without reviews keep the zero they are created with.
+    """
+    weight = settings.RATING_PRIOR_WEIGHT
+    return Case(
+        When(rating_count=-count, then=Value(0.0)),
+        default=(
+            Cast(F('rating_sum') + score, FloatField())
+            + Value(weight * settings.RATING_PRIOR_MEAN)
+        ) / Cast(F('rating_count') + count + weight, FloatField()),
+        output_field=FloatField()
+    )
+
+
+def average(total, count):
+    return total / count if count else None
+
+
+def apply_score(title_id, score=0, count=0, recent=0):
+    """Add score, count and trending counter deltas to the title totals.
+
+    Also moves the title modification date, which stamps its reviews.
+    Sends score_applied with the average before and after the deltas.
+    """
+    titles = Title.objects.filter(pk=title_id)
+    updated = titles.update(
+        rating_sum=F('rating_sum') + score,
+        rating_count=F('rating_count') + count,
+        weighted_rating=weighted_rating(score, count),
+        recent_reviews=F('recent_reviews') + recent,
+        modified=timezone.now(),
+    )
+    if not (updated and (score or count or recent)
+            and score_applied.has_listeners(Title)):
+        return
+    # The row is locked by the update, so the totals read back are ours.
+    total, votes = titles.values_list('rating_sum', 'rating_count').get()
+    score_applied.send(
+        sender=Title, title_id=title_id,
+        previous=average(total - score, votes - count),
+        rating=average(total, votes)
+    )
+
+
+def window_start(today=None):
+    """Return the first day of the trending window."""
+    today = today or timezone.localdate()
+    return today - timedelta(days=settings.TRENDING_WINDOW_DAYS - 1)
+
+
+def apply_activity(title_id, published, count):
+    """Add count reviews published at the moment to the trending window.
+
+    Return the delta of the title trending counter, which the caller
+    passes to apply_score(). Reviews published before the window are
+    already expired.
+    """
+    day = timezone.localdate(published)
+    if day < window_start():
+        return 0
+    activity = TitleActivity.objects.filter(title_id=title_id, day=day)
+    if not activity.update(reviews=F('reviews') + count):
+        if count < 0:
+            return 0
+        try:
+            with transaction.atomic():
+                activity.create(title_id=title_id, day=day, reviews=count)
+        except IntegrityError:
+            activity.update(reviews=F('reviews') + count)
+    return count
+
+
+@transaction.atomic
+def expire_activity(today=None):
+    """Drop the days that left the trending window from the counters.
+
+    Return the number of titles whose counters went down.
+    """
+    expired = TitleActivity.objects.filter(day__lt=window_start(today))
+    totals = list(
+        expired.order_by().values('title')
+        .annotate(total=Sum('reviews')).values_list('title', 'total')
+    )
+    for title_id, total in totals:
+        Title.objects.filter(pk=title_id).update(
+            recent_reviews=F('recent_reviews') - total)
+    expired.delete()
+    return len(totals)
+
+
+def rebuild_activity(titles):
+    """Recalculate the trending window of the titles from the reviews."""
+    start = timezone.make_aware(datetime.combine(window_start(), time.min))
+    TitleActivity.objects.filter(title__in=titles).delete()
+    days = (
+        Review.objects.filter(title__in=titles, pub_date__gte=start)
+        .annotate(day=TruncDate('pub_date')).order_by()
+        .values_list('title', 'day').annotate(total=Count('pk'))
+    )
+    TitleActivity.objects.bulk_create(
+        (
+            TitleActivity(title_id=title_id, day=day, reviews=total)
+            for title_id, day, total in days.iterator()
+        ),
+        batch_size=1000
+    )
+    activity = (
+        TitleActivity.objects.filter(title=OuterRef('pk'))
+        .order_by().values('title')
+    )
+    titles.update(recent_reviews=Coalesce(
+        Subquery(activity.annotate(total=Sum('reviews')).values('total')),
+        0
+    ))
+
+
+def rebuild_ratings(titles=None):
+    """Recalculate the stored totals from the reviews table.
+
+    Also moves the modification date of the titles and rebuilds their
+    trending window.
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = (
+        Review.objects.filter(title=OuterRef('pk'))
+        .order_by().values('title')
+    )
+    titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        ),
+        modified=timezone.now(),
+    )
+    rebuild_activity(titles)
+    return titles.update(weighted_rating=weighted_rating())
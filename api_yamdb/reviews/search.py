@@ -0,0 +1,116 @@
+"""Full-text search over title names.
+
+PostgreSQL uses GIN indexes on ``to_tsvector('simple', name)`` and
+``name gin_trgm_ops`` created by a migration; both are expression
+indexes, so the database keeps them current on every write.
+SQLite uses an external content FTS5 table kept in sync by triggers.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+
+SQLITE_TRIGGERS = {
+    'reviews_title_fts_insert': (
+        'AFTER INSERT ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts(rowid, name) '
+        'VALUES (new.id, new.name); END'
+    ),
+    'reviews_title_fts_delete': (
+        'AFTER DELETE ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name) '
+        "VALUES ('delete', old.id, old.name); END"
+    ),
+    'reviews_title_fts_update': (
+        'AFTER UPDATE OF name ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name) '
+        "VALUES ('delete', old.id, old.name); "
+        'INSERT INTO reviews_title_fts(rowid, name) '
+        'VALUES (new.id, new.name); END'
+    ),
+}
+
+
+def install_sqlite_index(connection):
+    """Create the FTS5 table and its triggers if they are missing.
+
+    SQLite drops triggers when a migration rebuilds ``reviews_title``,
+    so this runs after every migrate and reindexes when it had to
+    recreate anything.
+    """
+    if (connection.vendor != 'sqlite' or Title._meta.db_table
+            not in connection.introspection.table_names()):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+            " AND name LIKE 'reviews_title_fts%'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing >= {FTS_TABLE, *SQLITE_TRIGGERS}:
+            return
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "name, content='reviews_title', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def search_titles(queryset, query):
+    """Filter titles matching the query, best matches first."""
+    words = re.findall(r'[^\W_]+', query.lower())
+    if not words:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        match, rank = _postgresql_search(query, words)
+    elif vendor == 'sqlite':
+        match, rank = _sqlite_search(words)
+    else:
+        return queryset.filter(name__icontains=query)
+    return (
+        queryset.annotate(search_rank=rank).filter(match)
+        .order_by('-search_rank', 'name')
+    )
+
+
+def _postgresql_search(query, words):
+    name = f'"{Title._meta.db_table}"."name"'
+    tsvector = f"to_tsvector('simple', {name})"
+    tsquery = "to_tsquery('simple', %s)"
+    prefixes = ' & '.join(f'{word}:*' for word in words)
+    match = RawSQL(
+        f'({tsvector} @@ {tsquery} OR {name} %% %s)',
+        (prefixes, query), output_field=BooleanField()
+    )
+    rank = RawSQL(
+        f'ts_rank({tsvector}, {tsquery}) + similarity({name}, %s)',
+        (prefixes, query), output_field=FloatField()
+    )
+    return match, rank
+
+
+def _sqlite_search(words):
+    pk = f'"{Title._meta.db_table}"."id"'
+    prefixes = ' '.join(f'"{word}"*' for word in words)
+    match = RawSQL(
+        f'{pk} IN (SELECT rowid FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s)',
+        (prefixes,), output_field=BooleanField()
+    )
+    rank = RawSQL(
+        f'(SELECT -rank FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = {pk})',
+        (prefixes,), output_field=FloatField()
+    )
+    return match, rank
@@ -0,0 +1,67 @@
+"""Synthetic catalog data for benchmarks and load tests."""
+import random
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .ratings import rebuild_ratings
+
+User = get_user_model()
+
+
+def batched_create(model, objects, batch_size):
+    model.objects.bulk_create(objects, batch_size=batch_size)
+    # SQLite does not return primary keys from bulk inserts.
+    return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+@transaction.atomic
+def seed_catalog(titles=1000, genres_per_title=2, reviews_per_title=10,
+                 comments_per_review=2, categories=10, genres=20,
+                 batch_size=1000, seed=0):
+    """Fill empty catalog tables with generated rows."""
+    rng = random.Random(seed)
+    category_ids = batched_create(Category, [
+        Category(name=f'Category {number}', slug=f'category-{number}')
+        for number in range(categories)
+    ], batch_size)
+    genre_ids = batched_create(Genre, [
+        Genre(name=f'Genre {number}', slug=f'genre-{number}')
+        for number in range(genres)
+    ], batch_size)
+    user_ids = batched_create(User, [
+        User(username=f'user{number}', email=f'user{number}@yamdb.fake')
+        for number in range(max(reviews_per_title, 1))
+    ], batch_size)
+    title_ids = batched_create(Title, [
+        Title(
+            name=f'Title {number:07}', year=rng.randint(1900, 2020),
+            description=f'Description of title {number}. ' * 10,
+            category_id=rng.choice(category_ids)
+        )
+        for number in range(titles)
+    ], batch_size)
+    GenreTitle.objects.bulk_create((
+        GenreTitle(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in rng.sample(
+            genre_ids, min(genres_per_title, len(genre_ids)))
+    ), batch_size=batch_size)
+    review_ids = batched_create(Review, [
+        Review(
+            title_id=title_id, author_id=author_id,
+            text=f'Review of title {title_id}', score=rng.randint(1, 10)
+        )
+        for title_id in title_ids
+        for author_id in user_ids[:reviews_per_title]
+    ], batch_size)
+    Comment.objects.bulk_create((
+        Comment(
+            review_id=review_id, author_id=rng.choice(user_ids),
+            text=f'Comment on review {review_id}'
+        )
+        for review_id in review_ids
+        for _ in range(comments_per_review)
+    ), batch_size=batch_size)
+    rebuild_ratings()
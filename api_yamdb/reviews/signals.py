@@ -0,0 +1,81 @@
+"""Signal receivers for Reviews App."""
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .deletion import purging
+from .models import Comment, Review, Title
+from .ratings import apply_activity, apply_score
+from .search import install_sqlite_index
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, update_fields=None,
+                 **kwargs):
+    """Keep title rating totals and activity in step with the review."""
+    if raw:
+        return
+    title_id, score = getattr(instance, '_loaded_rating', (None, None))
+    if created:
+        apply_score(
+            instance.title_id, instance.score, 1,
+            apply_activity(instance.title_id, instance.pub_date, 1))
+    elif score is None or not (
+            update_fields is None or {'score', 'title'} & set(update_fields)):
+        apply_score(instance.title_id)
+    elif title_id == instance.title_id:
+        apply_score(title_id, instance.score - score)
+    else:
+        apply_score(
+            title_id, -score, -1,
+            apply_activity(title_id, instance.pub_date, -1))
+        apply_score(
+            instance.title_id, instance.score, 1,
+            apply_activity(instance.title_id, instance.pub_date, 1))
+    instance._loaded_rating = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Remove the deleted review from the title totals and activity."""
+    if purging.get():
+        return
+    apply_score(
+        instance.title_id, -instance.score, -1,
+        apply_activity(instance.title_id, instance.pub_date, -1))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, raw=False, **kwargs):
+    """Move the review modification date, which stamps its comments."""
+    if not (raw or purging.get()):
+        Review.objects.filter(pk=instance.review_id).update(
+            modified=timezone.now())
+
+
+@receiver(post_save, sender=get_user_model())
+def author_renamed(sender, instance, created, raw=False, **kwargs):
+    """Move the stamps of the reviews and comments showing the author.
+
+    The tombstone rename of a deleted user is skipped: its reviews and
+    comments are hidden by the deleted filter at once, and the stamps
+    move chunk by chunk when purge_deleted() removes them.
+    """
+    renamed = not (raw or created or instance.deleted) and (
+        getattr(instance, '_loaded_username', None) != instance.username)
+    instance._loaded_username = instance.username
+    if not renamed:
+        return
+    now = timezone.now()
+    Title.objects.filter(pk__in=Review.objects.filter(
+        author=instance).values('title')).update(modified=now)
+    Review.objects.filter(pk__in=Comment.objects.filter(
+        author=instance).values('review')).update(modified=now)
+
+
+def create_search_index(sender, using, **kwargs):
+    """Restore the SQLite title search index after migrations."""
+    install_sqlite_index(connections[using])
@@ -1,7 +1,17 @@
 """Admin integration of Users."""
+from api.admin import ScalableModelAdmin
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
+from .models import OutgoingEmail
+
 User = get_user_model()
 
-admin.site.register(User)
+
+@admin.register(User)
+class UserAdmin(ScalableModelAdmin):
+    list_display = ('username', 'email', 'role', 'is_staff', 'date_joined')
+    exact_search_fields = ('id', 'username', 'email')
+
+
+admin.site.register(OutgoingEmail)
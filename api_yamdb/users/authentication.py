@@ -0,0 +1,109 @@
+"""Authentication for Users App."""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+GENERATION_KEY = 'users:auth:generation:{}'
+
+User = get_user_model()
+
+
+class UserCache:
+    """Per-process LRU cache of user rows with a time to live.
+
+    The time to live is read from AUTH_USER_CACHE_TTL on every call,
+    zero turns the cache off.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @property
+    def ttl(self):
+        return settings.AUTH_USER_CACHE_TTL
+
+    def get(self, user_id, generation):
+        """Return a fresh User instance or None on a miss."""
+        if self.ttl <= 0:
+            return None
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, cached_generation, db, field_names, values = entry
+            if expires < time.monotonic() or cached_generation != generation:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        # Every request gets its own instance, nothing is shared
+        # between threads.
+        return User.from_db(db, field_names, values)
+
+    def set(self, user_id, generation, user):
+        if self.ttl <= 0:
+            return
+        fields = User._meta.concrete_fields
+        entry = (
+            time.monotonic() + self.ttl, generation, user._state.db,
+            [field.attname for field in fields],
+            [getattr(user, field.attname) for field in fields],
+        )
+        with self.lock:
+            self.entries[user_id] = entry
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE)
+
+
+def invalidate_user(user_id):
+    """Drop the cached user in this and, via the cache, other processes.
+
+    Saves and deletes call it through users.signals. QuerySet.update()
+    sends no signals, so code updating users in bulk must call it for
+    every changed user.
+    """
+    user_cache.discard(user_id)
+    cache.set(GENERATION_KEY.format(user_id), time.time_ns(), timeout=None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that keeps recently seen users in memory.
+
+    Cached users are checked against a generation stamp in the Django
+    cache, which is moved on every save or delete of the user. Other
+    workers only see the stamp through a shared cache, which is why
+    AUTH_USER_CACHE_TTL defaults to zero with a process-local one.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification')
+        generation = cache.get(GENERATION_KEY.format(user_id))
+        user = user_cache.get(user_id, generation)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, generation, user)
+        return user
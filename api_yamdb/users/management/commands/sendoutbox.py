@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from users.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Use this command to send queued emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox instead of sending one batch.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Seconds to wait when the outbox is drained.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_pending(options['batch_size'],
+                                options['max_attempts'])
+            if sent:
+                self.stdout.write(f'Sent {sent} emails')
+            if not options['loop']:
+                return
+            if sent < options['batch_size']:
+                time.sleep(options['interval'])
@@ -1,9 +1,17 @@
 """Mosels for Users App."""
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+class LiveUserManager(UserManager):
+    """Manager that hides soft-deleted users."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
 class User(AbstractUser):
     """New User class."""
 
@@ -45,11 +53,50 @@ class User(AbstractUser):
         max_length=40,
         blank=True,
     )
+    deleted = models.DateTimeField(
+        'Дата удаления',
+        null=True,
+        blank=True,
+    )
+
+    objects = LiveUserManager()
+    all_objects = models.Manager()
 
     class Meta:
         """Users meta class."""
 
         ordering = ['username']
+        indexes = [
+            models.Index(
+                fields=['deleted'],
+                condition=models.Q(deleted__isnull=False),
+                name='users_user_deleted_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Renames move the stamps of the user's reviews and comments,
+        # see reviews.signals.author_renamed.
+        instance._loaded_username = dict(zip(field_names, values)).get(
+            'username')
+        return instance
+
+    def mark_deleted(self):
+        """Hide the user and free the username and email.
+
+        The tombstone name cannot pass the username validators, so it
+        never clashes with a real user. Reviews and comments of the
+        user are removed later by purge_deleted().
+        """
+        tombstone = f'deleted:{self.pk}'
+        self.deleted = timezone.now()
+        self.is_active = False
+        self.username = tombstone
+        self.email = tombstone
+        self.save(
+            update_fields=['deleted', 'is_active', 'username', 'email'])
 
     @property
     def is_admin(self):
@@ -61,3 +108,32 @@ class User(AbstractUser):
     def is_moderator(self):
         """Retrieve admoderator state."""
         return self.role == self.Roles.MODERATOR
+
+
+class OutgoingEmail(models.Model):
+    """Email queued by a request and sent by the outbox worker."""
+
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.EmailField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель', max_length=254)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    sent = models.DateTimeField('Отправлено', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Ошибка', blank=True)
+
+    class Meta:
+        """Outbox meta class."""
+
+        ordering = ['send_after']
+        indexes = [
+            models.Index(
+                fields=['send_after'],
+                condition=models.Q(sent__isnull=True),
+                name='users_outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
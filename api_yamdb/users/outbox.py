@@ -0,0 +1,101 @@
+"""Transactional email outbox for Users App.
+
+Requests only insert OutgoingEmail rows, in the same transaction as
+the data they refer to. The sendoutbox worker, or a background thread
+when EMAIL_OUTBOX_SEND_ON_COMMIT is set, delivers them in batches and
+retries failures with exponential backoff. A batch is claimed in a
+short transaction and sent after it commits, so no row lock is held
+while talking to the mail server.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+RETRY_DELAY = timedelta(seconds=30)
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=1)
+
+
+def enqueue(subject, body, from_email, recipient):
+    """Queue an email to be sent after the current transaction."""
+    OutgoingEmail.objects.create(
+        subject=subject, body=body, from_email=from_email,
+        recipient=recipient
+    )
+    if settings.EMAIL_OUTBOX_SEND_ON_COMMIT:
+        transaction.on_commit(lambda: executor.submit(send_in_background))
+
+
+def send_in_background():
+    try:
+        send_pending()
+    finally:
+        connections.close_all()
+
+
+def claim(now, batch_size, max_attempts):
+    """Take a batch of due emails away from other senders.
+
+    The rows are locked only while their attempt is counted and their
+    send_after moved past CLAIM_TIMEOUT. Emails of a sender that dies
+    before recording the result are due again after that.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(sent__isnull=True, attempts__lt=max_attempts,
+                    send_after__lte=now)
+            .order_by('send_after')[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.send_after = now + CLAIM_TIMEOUT
+        OutgoingEmail.objects.bulk_update(emails, ('attempts', 'send_after'))
+    return emails
+
+
+def send_pending(batch_size=100, max_attempts=5):
+    """Send one batch of due emails and return how many were sent."""
+    now = timezone.now()
+    emails = claim(now, batch_size, max_attempts)
+    if not emails:
+        return 0
+    sent = 0
+    mail_connection = get_connection()
+    try:
+        # Reuse one connection for the batch; if it cannot be opened
+        # every send below retries it and records the error.
+        mail_connection.open()
+    except Exception:
+        logger.exception('Cannot open the mail connection')
+    try:
+        for email in emails:
+            try:
+                EmailMessage(
+                    email.subject, email.body, email.from_email,
+                    [email.recipient], connection=mail_connection
+                ).send()
+            except Exception as error:
+                logger.warning(
+                    'Email %s to %s failed on attempt %s: %s',
+                    email.pk, email.recipient, email.attempts, error)
+                email.last_error = str(error)
+                email.send_after = now + RETRY_DELAY * 2 ** email.attempts
+            else:
+                email.sent = timezone.now()
+                sent += 1
+    finally:
+        mail_connection.close()
+    OutgoingEmail.objects.bulk_update(
+        emails, ('last_error', 'send_after', 'sent'))
+    return sent
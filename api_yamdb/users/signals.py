@@ -0,0 +1,15 @@
+"""Signal receivers for Users App."""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Invalidate the authentication cache of the changed user."""
+    invalidate_user(instance.pk)
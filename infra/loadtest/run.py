@@ -0,0 +1,226 @@
+"""Compare gunicorn worker profiles against a seeded SQLite database.
+
+Run from the repository root with the app and loadtest requirements:
+
+    pip install -r api_yamdb/requirements.txt \\
+        -r infra/loadtest/requirements.txt
+    python infra/loadtest/run.py --titles 2000 --duration 20
+
+The database is migrated and filled by seedcatalog once and reused by
+later runs. Every profile starts gunicorn with api_yamdb/gunicorn.conf.py
+and its own GUNICORN_* overrides. After a warm-up, client processes
+hold keep-alive connections and request catalog routes in turn for
+--duration seconds. The report gives requests per second, p50 and p99
+latency and the number of failed requests of each profile.
+
+The catalog cache is replaced with DummyCache unless --cache is given,
+so the numbers measure the workers and the database, not cache hits.
+"""
+import argparse
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from http.client import HTTPConnection
+
+APP_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'api_yamdb')
+WSGI_APP = 'api_yamdb.wsgi:application'
+ASGI_APP = 'api_yamdb.asgi:application'
+
+PROFILES = {
+    # Gunicorn turns sync workers with several threads into gthread.
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_THREADS': '1'},
+    'gthread': {'GUNICORN_WORKER_CLASS': 'gthread'},
+    'uvicorn': {'GUNICORN_WORKER_CLASS': 'uvicorn.workers.UvicornWorker'},
+}
+
+
+def django_env(options):
+    env = dict(
+        os.environ,
+        DB_ENGINE='django.db.backends.sqlite3',
+        DB_NAME=os.path.abspath(options.db),
+        SLOW_QUERY_CAPTURE='',
+    )
+    if not options.cache:
+        env['CACHE_BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+    return env
+
+
+def seed(options):
+    if options.reseed and os.path.exists(options.db):
+        os.unlink(options.db)
+    if os.path.exists(options.db):
+        return
+    env = django_env(options)
+    for command in (
+        ['migrate', '--verbosity', '0'],
+        ['seedcatalog', '--titles', str(options.titles),
+         '--reviews-per-title', str(options.reviews_per_title)],
+    ):
+        subprocess.run(
+            [sys.executable, 'manage.py', *command],
+            cwd=APP_DIR, env=env, check=True)
+
+
+def request_paths(db):
+    """Return a mix of catalog routes pointing at seeded rows."""
+    with sqlite3.connect(db) as connection:
+        reviews = connection.execute(
+            'SELECT title_id, id FROM reviews_review '
+            'ORDER BY id LIMIT 50').fetchall()
+        titles = [row[0] for row in connection.execute(
+            'SELECT id FROM reviews_title ORDER BY id LIMIT 50')]
+        slugs = [row[0] for row in connection.execute(
+            'SELECT slug FROM reviews_category ORDER BY id LIMIT 5')]
+    paths = ['/api/v1/categories/', '/api/v1/genres/', '/api/v1/titles/']
+    paths += [f'/api/v1/titles/?category={slug}' for slug in slugs]
+    paths += [f'/api/v1/titles/{title}/' for title in titles]
+    for title, review in reviews:
+        paths.append(f'/api/v1/titles/{title}/reviews/')
+        paths.append(f'/api/v1/titles/{title}/reviews/{review}/comments/')
+    return paths
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, options, port):
+    env = django_env(options)
+    if options.workers:
+        env['GUNICORN_WORKERS'] = str(options.workers)
+    if options.threads:
+        env['GUNICORN_THREADS'] = str(options.threads)
+    env.update(PROFILES[name], GUNICORN_BIND=f'127.0.0.1:{port}')
+    app = ASGI_APP if name == 'uvicorn' else WSGI_APP
+    server = subprocess.Popen(
+        ['gunicorn', app, '--config', 'gunicorn.conf.py'],
+        cwd=APP_DIR, env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'{name}: gunicorn exited')
+        connection = HTTPConnection('127.0.0.1', port, timeout=1)
+        try:
+            connection.request('GET', '/api/v1/categories/')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+        finally:
+            connection.close()
+    server.terminate()
+    raise RuntimeError(f'{name}: gunicorn did not answer in 60 seconds')
+
+
+def run_client(args):
+    """Request paths in turn until the deadline, return the latencies."""
+    port, paths, offset, deadline = args
+    connection = HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies = []
+    errors = 0
+    number = offset
+    while time.time() < deadline:
+        path = paths[number % len(paths)]
+        number += 1
+        started = time.perf_counter()
+        try:
+            connection.request(
+                'GET', path, headers={'Accept': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+        except OSError:
+            # The next request opens a new connection.
+            connection.close()
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        if response.status != 200:
+            errors += 1
+    connection.close()
+    return latencies, errors
+
+
+def percentile(values, share):
+    """Return the nearest-rank percentile of sorted values."""
+    if not values:
+        return 0
+    return values[max(math.ceil(share * len(values)) - 1, 0)]
+
+
+def load(port, paths, options, duration):
+    deadline = time.time() + duration
+    with multiprocessing.Pool(options.concurrency) as pool:
+        results = pool.map(run_client, [
+            (port, paths, client * 7, deadline)
+            for client in range(options.concurrency)
+        ])
+    latencies = sorted(
+        latency for client, _ in results for latency in client)
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'errors': sum(errors for _, errors in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--db', default='/tmp/yamdb-loadtest.sqlite3')
+    parser.add_argument('--reseed', action='store_true')
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews-per-title', type=int, default=5)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--threads', type=int)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument(
+        '--cache', action='store_true',
+        help='Keep the configured cache instead of DummyCache.')
+    parser.add_argument('--report', help='Write the results as JSON.')
+    options = parser.parse_args()
+
+    seed(options)
+    paths = request_paths(options.db)
+    report = {}
+    for name in options.profiles:
+        if name == 'uvicorn' and importlib.util.find_spec('uvicorn') is None:
+            print('uvicorn: skipped, uvicorn is not installed')
+            continue
+        port = free_port()
+        server = start_server(name, options, port)
+        try:
+            load(port, paths, options, options.warmup)
+            report[name] = load(port, paths, options, options.duration)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+    print(f'{"profile":<10}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}'
+          f'{"errors":>8}')
+    for name, result in report.items():
+        print(f'{name:<10}{result["rps"]:>10}{result["p50_ms"]:>10}'
+              f'{result["p99_ms"]:>10}{result["errors"]:>8}')
+    if options.report:
+        with open(options.report, 'w') as file:
+            json.dump(report, file, indent=4, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import pytest
+from api.v1 import registry
+from django.core.cache import cache
+from reviews.models import Category, Genre, GenreTitle, Title
+from users.authentication import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
+    # Rolled back tests reuse cache versions, snapshots must not leak.
+    registry.categories.clear()
+    registry.genres.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def user_cache_ttl(settings):
+    # Tests run in one process, so the local cache is shared.
+    settings.AUTH_USER_CACHE_TTL = 60
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Фильм', slug='films')
+
+
+@pytest.fixture
+def genres():
+    Genre.objects.bulk_create([
+        Genre(name='Драма', slug='drama'),
+        Genre(name='Комедия', slug='comedy'),
+    ])
+    return list(Genre.objects.all())
+
+
+@pytest.fixture
+def titles(category, genres):
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number:04}', year=2000, category=category)
+        for number in range(1000)
+    )
+    GenreTitle.objects.bulk_create(
+        GenreTitle(genre=genre, title_id=title_id)
+        for title_id in Title.objects.values_list('id', flat=True)
+        for genre in genres
+    )
+    return Title.objects.all()
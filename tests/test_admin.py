@@ -0,0 +1,84 @@
+import pytest
+from django.test import Client
+from reviews.models import Comment, Review
+
+
+@pytest.fixture
+def admin_site_client(django_user_model):
+    superuser = django_user_model.objects.create_superuser(
+        username='TestSuperuser', email='superuser@yamdb.fake',
+        password='1234567'
+    )
+    client = Client()
+    client.force_login(superuser)
+    return client
+
+
+@pytest.fixture
+def reviews(titles, user, admin):
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5)
+        for title in titles[:15] for author in (user, admin)
+    ]
+    for review in reviews:
+        Comment.objects.create(review=review, author=user, text='Да')
+    return reviews
+
+
+@pytest.mark.django_db
+class TestAdmin:
+
+    @pytest.mark.parametrize('model', (
+        'reviews/title', 'reviews/review', 'reviews/comment',
+        'reviews/genretitle', 'reviews/category', 'users/user',
+    ))
+    def test_changelist_queries_do_not_grow(self, admin_site_client,
+                                            reviews, model,
+                                            django_assert_max_num_queries):
+        with django_assert_max_num_queries(10):
+            response = admin_site_client.get(f'/admin/{model}/')
+
+        assert response.status_code == 200
+
+    def test_count_is_capped(self, admin_site_client, settings, titles):
+        settings.ADMIN_COUNT_LIMIT = 100
+
+        response = admin_site_client.get('/admin/reviews/title/')
+
+        assert response.context['cl'].result_count == 100, (
+            'Проверьте, что список в админке не считает все строки'
+        )
+
+    def test_change_form_has_no_full_selects(self, admin_site_client,
+                                             reviews):
+        review = reviews[0]
+
+        response = admin_site_client.get(
+            f'/admin/reviews/review/{review.id}/change/')
+
+        assert response.status_code == 200
+        assert 'Произведение 0999' not in response.content.decode(), (
+            'Проверьте, что форма отзыва не выводит все произведения'
+        )
+
+    def test_exact_search(self, admin_site_client, reviews, user):
+        response = admin_site_client.get(
+            '/admin/reviews/review/', {'q': user.username})
+
+        results = response.context['cl'].result_list
+        assert len(results) == 15
+        assert all(review.author_id == user.id for review in results)
+
+        response = admin_site_client.get(
+            '/admin/reviews/review/', {'q': reviews[-1].id})
+
+        assert list(response.context['cl'].result_list) == [reviews[-1]]
+
+    def test_title_search_uses_full_text_index(self, admin_site_client,
+                                               titles):
+        response = admin_site_client.get(
+            '/admin/reviews/title/', {'q': 'произведение 0042'})
+
+        assert [title.name for title in response.context[
+            'cl'].result_list] == ['Произведение 0042']
@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestAuthenticationCache:
+
+    def test_authenticated_read_skips_user_query(
+            self, user_client, django_assert_num_queries):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/users/me/')
+
+        assert response.status_code == 200
+        assert response.json()['username'] == 'TestUser'
+
+    def test_role_change_invalidates_cached_user(self, user, user_client):
+        assert user_client.get('/api/v1/users/').status_code == 403
+
+        user.role = 'admin'
+        user.save()
+
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что смена роли сразу учитывается при авторизации'
+        )
+
+    def test_deactivated_user_is_rejected(self, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+
+        user.is_active = False
+        user.save()
+
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_local_cache_turns_user_cache_off(
+            self, settings, user_client, django_assert_num_queries):
+        # Role changes in other workers would not reach a local cache.
+        settings.AUTH_USER_CACHE_TTL = 0
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+
+        with django_assert_num_queries(1):
+            response = user_client.get('/api/v1/users/me/')
+
+        assert response.status_code == 200
@@ -0,0 +1,147 @@
+import pytest
+from reviews.models import GenreTitle, Review, Title
+
+
+def title_payload(number, category='films', genres=('drama', 'comedy')):
+    return {
+        'name': f'Новое произведение {number}', 'year': 2001,
+        'category': category, 'genre': list(genres),
+    }
+
+
+@pytest.mark.django_db
+class TestTitleBatch:
+    url = '/api/v1/titles/batch/'
+
+    def test_batch_requires_admin(self, user_client, category, genres):
+        response = user_client.post(
+            self.url, [title_payload(0)], format='json')
+
+        assert response.status_code == 403
+
+    def test_batch_creates_titles_with_genres(
+            self, admin_client, category, genres,
+            django_assert_max_num_queries):
+        payload = [title_payload(number) for number in range(500)]
+
+        with django_assert_max_num_queries(20):
+            response = admin_client.post(self.url, payload, format='json')
+
+        assert response.status_code == 201
+        data = response.json()
+        assert len(data) == 500
+        assert data[0]['category']['slug'] == 'films'
+        assert {genre['slug'] for genre in data[0]['genre']} == {
+            'drama', 'comedy'}
+        assert Title.objects.count() == 500
+        assert GenreTitle.objects.count() == 1000, (
+            'Проверьте, что жанры произведений сохраняются'
+        )
+        assert sorted(item['id'] for item in data) == sorted(
+            Title.objects.values_list('id', flat=True))
+
+    def test_batch_ignores_repeated_genres(
+            self, admin_client, category, genres):
+        payload = [title_payload(0, genres=('drama', 'drama', 'comedy'))]
+
+        response = admin_client.post(self.url, payload, format='json')
+
+        assert response.status_code == 201
+        assert sorted(
+            genre['slug'] for genre in response.json()[0]['genre']
+        ) == ['comedy', 'drama']
+        assert GenreTitle.objects.count() == 2
+
+    def test_batch_reports_errors_per_item(self, admin_client, titles):
+        existing = titles.first()
+        payload = [
+            title_payload(1),
+            title_payload(2, category='unknown'),
+            title_payload(3, genres=('drama', 'unknown')),
+            {'name': existing.name, 'year': existing.year,
+             'category': 'films', 'genre': []},
+            title_payload(1),
+            {'name': 'Без года'},
+        ]
+
+        response = admin_client.post(self.url, payload, format='json')
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert set(errors[1]) == {'category'}
+        assert set(errors[2]) == {'genre'}
+        assert set(errors[3]) == {'non_field_errors'}
+        assert set(errors[4]) == {'non_field_errors'}, (
+            'Проверьте, что дубликаты внутри пакета отклоняются'
+        )
+        assert set(errors[5]) == {'year', 'category', 'genre'}
+        assert Title.objects.count() == 1000, (
+            'Проверьте, что при ошибке не создаётся ни одно произведение'
+        )
+
+@pytest.mark.django_db
+class TestReviewBatch:
+    url = '/api/v1/reviews/batch/'
+
+    def test_batch_creates_reviews_and_ratings(self, admin_client, user,
+                                               admin, titles):
+        first, second = titles[:2]
+        payload = [
+            {'title': first.id, 'author': user.username, 'text': 'Да',
+             'score': 10},
+            {'title': first.id, 'author': admin.username, 'text': 'Нет',
+             'score': 4},
+            {'title': second.id, 'author': user.username, 'text': 'Так',
+             'score': 5},
+        ]
+
+        response = admin_client.post(self.url, payload, format='json')
+
+        assert response.status_code == 201
+        assert [item['author'] for item in response.json()] == [
+            user.username, admin.username, user.username]
+        assert Review.objects.count() == 3
+        first.refresh_from_db()
+        assert first.rating == 7, (
+            'Проверьте, что рейтинг пересчитывается после импорта отзывов'
+        )
+
+    def test_batch_reports_errors_per_item(self, admin_client, user, titles):
+        title = titles.first()
+        Review.objects.create(title=title, author=user, text='Был', score=1)
+        payload = [
+            {'title': title.id, 'author': user.username, 'text': 'Снова',
+             'score': 2},
+            {'title': 0, 'author': 'nobody', 'text': 'Нет', 'score': 3},
+        ]
+
+        response = admin_client.post(self.url, payload, format='json')
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert set(errors[0]) == {'non_field_errors'}
+        assert set(errors[1]) == {'title', 'author'}
+        assert Review.objects.count() == 1
+
+    def test_batch_keeps_imported_dates(self, admin_client, user, admin,
+                                        titles):
+        title = titles.first()
+        payload = [
+            {'title': title.id, 'author': user.username, 'text': 'Старый',
+             'score': 6, 'pub_date': '2019-09-24T21:08:21.567000Z'},
+            {'title': title.id, 'author': admin.username, 'text': 'Новый',
+             'score': 8},
+        ]
+
+        response = admin_client.post(self.url, payload, format='json')
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data[0]['pub_date'] == '2019-09-24T21:08:21.567000Z'
+        dates = dict(Review.objects.values_list('author', 'pub_date'))
+        assert dates[user.id].isoformat() == (
+            '2019-09-24T21:08:21.567000+00:00'), (
+            'Проверьте, что импорт сохраняет переданную дату публикации'
+        )
+        assert dates[admin.id].year > 2019
@@ -0,0 +1,285 @@
+"""Query count, latency and allocation benchmarks for API v1 routes.
+
+The catalog is seeded once per module at a scale taken from the
+``YAMDB_BENCHMARK_*`` environment variables. Every measured request runs
+with an empty response cache inside a rolled back transaction, so the
+numbers describe the database path and write routes can be repeated.
+"""
+import json
+import math
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from api.v1.cache import bump_version
+from api.v1.renderers import ORJSONRenderer
+from api.v1.serializers import TitleSerializer
+from api.v1.urls import urlpatterns
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from reviews.models import Category, Genre, Title
+from reviews.seed import seed_catalog
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .fixtures.fixture_user import token_client
+
+User = get_user_model()
+
+SCALE = {
+    name: int(os.getenv(f'YAMDB_BENCHMARK_{name.upper()}', default))
+    for name, default in (
+        ('titles', 200),
+        ('genres_per_title', 2),
+        ('reviews_per_title', 5),
+        ('comments_per_review', 2),
+    )
+}
+REPEAT = int(os.getenv('YAMDB_BENCHMARK_REPEAT', 20))
+BATCH_SIZE = 10
+REPORT = os.getenv('YAMDB_BENCHMARK_REPORT', 'benchmark_report.json')
+BUDGETS = json.loads(
+    (Path(__file__).parent / 'benchmark_budgets.json').read_text())
+
+ROUTES = {
+    'api-root': lambda data: ('user', 'get', reverse('api-root'), None),
+    'signup': lambda data: (
+        'anonymous', 'post', reverse('signup'),
+        {'username': 'benchmark', 'email': 'benchmark@yamdb.fake'}
+    ),
+    'token': lambda data: (
+        'anonymous', 'post', reverse('token'),
+        {
+            'username': data.user.username,
+            'confirmation_code': default_token_generator.make_token(
+                data.user),
+        }
+    ),
+    'me': lambda data: ('user', 'get', reverse('me'), None),
+    'metrics': lambda data: ('admin', 'get', reverse('metrics'), None),
+    'category-list': lambda data: (
+        'anonymous', 'get', reverse('category-list'), None),
+    'category-detail': lambda data: (
+        'admin', 'delete',
+        reverse('category-detail', args=[data.category.slug]), None
+    ),
+    'genre-list': lambda data: (
+        'anonymous', 'get', reverse('genre-list'), None),
+    'genre-detail': lambda data: (
+        'admin', 'delete', reverse('genre-detail', args=[data.genre.slug]),
+        None
+    ),
+    'title-list': lambda data: (
+        'anonymous', 'get', reverse('title-list'), None),
+    'title-detail': lambda data: (
+        'anonymous', 'get', reverse('title-detail', args=[data.title.id]),
+        None
+    ),
+    'title-top': lambda data: (
+        'anonymous', 'get', reverse('title-top'), None),
+    'title-trending': lambda data: (
+        'anonymous', 'get', reverse('title-trending'), None),
+    'title-export': lambda data: (
+        'admin', 'get', reverse('title-export'), None),
+    'title-batch': lambda data: (
+        'admin', 'post', reverse('title-batch'),
+        [
+            {
+                'name': f'Batch title {number}', 'year': 2000,
+                'category': data.category.slug, 'genre': [data.genre.slug],
+            }
+            for number in range(BATCH_SIZE)
+        ]
+    ),
+    'review-batch': lambda data: (
+        'admin', 'post', reverse('review-batch'),
+        [
+            {
+                'title': title.id, 'author': data.admin.username,
+                'text': 'Batch review', 'score': 5,
+            }
+            for title in data.titles
+        ]
+    ),
+    'user-list': lambda data: ('admin', 'get', reverse('user-list'), None),
+    'user-detail': lambda data: (
+        'admin', 'get', reverse('user-detail', args=[data.user.username]),
+        None
+    ),
+    'reviews-list': lambda data: (
+        'anonymous', 'get', reverse('reviews-list', args=[data.title.id]),
+        None
+    ),
+    'reviews-detail': lambda data: (
+        'anonymous', 'get',
+        reverse('reviews-detail', args=[data.title.id, data.review.id]), None
+    ),
+    'comments-list': lambda data: (
+        'anonymous', 'get',
+        reverse('comments-list', args=[data.title.id, data.review.id]), None
+    ),
+    'comments-detail': lambda data: (
+        'anonymous', 'get',
+        reverse('comments-detail',
+                args=[data.title.id, data.review.id, data.comment.id]),
+        None
+    ),
+}
+
+
+def route_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from route_names(pattern.url_patterns)
+        else:
+            yield pattern.name
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def send(client, method, path, payload):
+    """Send a request in a transaction that is rolled back afterwards."""
+    with transaction.atomic():
+        response = getattr(client, method)(path, payload, format='json')
+        if response.streaming:
+            b''.join(response.streaming_content)
+        transaction.set_rollback(True)
+    return response
+
+
+def measure(client, method, path, payload):
+    """Return the status, query count, timings and allocation peak."""
+    send(client, method, path, payload)
+    queries, timings = 0, []
+    for _ in range(REPEAT):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = send(client, method, path, payload)
+            timings.append((time.perf_counter() - started) * 1000)
+        # Savepoint statements are not part of the route's cost.
+        queries = max(queries, len([
+            query for query in context.captured_queries
+            if 'SAVEPOINT' not in query['sql']
+        ]))
+    cache.clear()
+    tracemalloc.start()
+    send(client, method, path, payload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'status': response.status_code,
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+@pytest.fixture(scope='module')
+def catalog(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        seed_catalog(**SCALE)
+        titles = list(Title.objects.order_by('name')[:BATCH_SIZE])
+        title = titles[0]
+        review = title.reviews.order_by('pk').first()
+        yield SimpleNamespace(
+            category=Category.objects.first(),
+            genre=Genre.objects.first(),
+            titles=titles,
+            title=title,
+            review=review,
+            comment=review.comments.order_by('pk').first(),
+            user=review.author,
+            admin=User.objects.create_user(
+                username='benchmark_admin', email='admin@yamdb.fake',
+                role='admin'
+            ),
+        )
+        call_command('flush', interactive=False, verbosity=0)
+        # Flush also drops the cache versions created by the migration.
+        bump_version('categories', 'genres', 'titles', 'rankings')
+
+
+@pytest.fixture(scope='module')
+def report():
+    results = {'routes': {}, 'renderers': {}}
+    yield results
+    with open(REPORT, 'w', encoding='utf8') as file:
+        json.dump(dict(
+            results, database=connection.vendor, scale=SCALE, repeat=REPEAT
+        ), file, indent=2, sort_keys=True)
+
+
+def test_every_route_is_benchmarked():
+    names = set(route_names(urlpatterns))
+    assert names == set(ROUTES), (
+        'Добавьте в бенчмарк все маршруты из api/v1/urls.py'
+    )
+    assert names == set(BUDGETS), (
+        'Добавьте бюджеты для всех маршрутов в benchmark_budgets.json'
+    )
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+
+    @pytest.mark.parametrize('name', sorted(ROUTES))
+    def test_route_within_budget(self, name, catalog, report):
+        client, method, path, payload = ROUTES[name](catalog)
+        client = {
+            'anonymous': APIClient(),
+            'user': token_client(catalog.user),
+            'admin': token_client(catalog.admin),
+        }[client]
+
+        result = measure(client, method, path, payload)
+        report['routes'][name] = dict(
+            result, method=method.upper(), path=path)
+
+        assert result['status'] < 400, (
+            f'Маршрут {name} вернул статус {result["status"]}'
+        )
+        budget = BUDGETS[name]
+        for metric in ('queries', 'p95_ms', 'peak_kib'):
+            assert result[metric] <= budget[metric], (
+                f'{name}: {metric} = {result[metric]} '
+                f'превышает бюджет {budget[metric]}'
+            )
+
+    def test_fast_json_renderer(self, catalog, report):
+        data = TitleSerializer(
+            Title.objects.select_related('category').prefetch_related('genre'),
+            many=True
+        ).data
+        contents = {}
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                content = renderer.render(data)
+            elapsed = time.perf_counter() - started
+            contents[type(renderer).__name__] = content
+            report['renderers'][type(renderer).__name__] = {
+                'bytes': len(content),
+                'renders_per_s': round(REPEAT / elapsed, 1),
+                'mib_per_s': round(
+                    len(content) * REPEAT / elapsed / 1024 ** 2, 1),
+            }
+
+        assert contents['ORJSONRenderer'] == contents['JSONRenderer']
+        renderers = report['renderers']
+        assert (renderers['ORJSONRenderer']['renders_per_s']
+                > renderers['JSONRenderer']['renders_per_s']), (
+            'ORJSONRenderer медленнее стандартного JSONRenderer'
+        )
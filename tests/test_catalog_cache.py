@@ -0,0 +1,113 @@
+import hashlib
+import threading
+
+import pytest
+from api.v1 import cache as catalog_cache
+from django.core.cache import cache
+from django.db import transaction
+from reviews.models import Review
+
+
+def stats_since(before):
+    # The counters are kept for the life of the process.
+    stats = catalog_cache.cache_stats()
+    return {name: stats[name] - before[name] for name in stats}
+
+
+@pytest.mark.django_db
+class TestCatalogCache:
+    url = '/api/v1/titles/'
+
+    def test_anonymous_reads_hit_the_cache(
+            self, client, titles, django_assert_num_queries):
+        before = catalog_cache.cache_stats()
+        assert client.get(self.url).status_code == 200
+
+        # Only the cache version is read.
+        with django_assert_num_queries(1):
+            response = client.get(self.url)
+
+        assert response.status_code == 200
+        assert stats_since(before) == {'hits': 1, 'misses': 1}
+
+    def test_authenticated_reads_skip_the_cache(self, user_client, titles):
+        before = catalog_cache.cache_stats()
+        user_client.get(self.url)
+        user_client.get(self.url)
+
+        assert stats_since(before) == {'hits': 0, 'misses': 0}
+
+    def test_write_invalidates_after_commit(
+            self, client, titles, admin,
+            django_capture_on_commit_callbacks):
+        title = titles.first()
+        detail = f'{self.url}{title.id}/'
+        assert client.get(detail).json()['rating'] is None
+        version = catalog_cache.get_version('titles')
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                Review.objects.create(
+                    title=title, author=admin, text='Отзыв', score=8)
+                assert catalog_cache.get_version('titles') == version, (
+                    'Проверьте, что версия кеша меняется только после '
+                    'фиксации транзакции'
+                )
+
+        assert callbacks
+        assert catalog_cache.get_version('titles') != version
+        assert client.get(detail).json()['rating'] == 8
+
+    def test_concurrent_miss_waits_for_the_renderer(self):
+        path = '/api/v1/titles/?page=2'
+        key = catalog_cache.RESPONSE_KEY.format(
+            'titles', catalog_cache.get_version('titles'),
+            hashlib.md5(path.encode()).hexdigest())
+        cache.add(f'{key}:lock', 1)
+        before = catalog_cache.cache_stats()
+
+        def finish_render():
+            cache.set(key, {'results': []})
+            cache.delete(f'{key}:lock')
+
+        timer = threading.Timer(0.2, finish_render)
+        timer.start()
+        try:
+            data = catalog_cache.fetch(
+                ('titles',), path, lambda: pytest.fail(
+                    'Проверьте, что страницу рендерит один запрос'))
+        finally:
+            timer.join()
+
+        assert data == {'results': []}
+        assert stats_since(before)['hits'] == 1
+
+    def test_review_writes_keep_other_title_pages(
+            self, client, titles, user, admin, django_user_model,
+            django_capture_on_commit_callbacks):
+        first, second = titles[:2]
+        Review.objects.create(title=first, author=user, text='Да', score=8)
+        pages = (self.url, f'{self.url}{first.id}/', f'{self.url}{second.id}/')
+        for url in pages:
+            client.get(url)
+
+        before = catalog_cache.cache_stats()
+        with django_capture_on_commit_callbacks(execute=True):
+            Review.objects.create(
+                title=first, author=admin, text='Тоже', score=8)
+        list_page, first_page, second_page = (client.get(url) for url in pages)
+
+        assert stats_since(before) == {'hits': 2, 'misses': 1}, (
+            'Проверьте, что отзыв сбрасывает кеш только своего произведения, '
+            'пока рейтинг в списке не меняется'
+        )
+        assert first_page.json()['rating'] == 8
+
+        before = catalog_cache.cache_stats()
+        with django_capture_on_commit_callbacks(execute=True):
+            Review.objects.create(
+                title=first, text='Нет', score=2,
+                author=django_user_model.objects.create(username='critic'))
+
+        assert client.get(self.url).json()['results'][0]['rating'] == 6
+        assert stats_since(before) == {'hits': 0, 'misses': 1}
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.cache import cache
+from reviews.deletion import purge_deleted
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def review(titles, user):
+    return Review.objects.create(
+        title=titles.first(), author=user, text='Отзыв', score=5)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_titles_answer_not_modified(self, client, titles):
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        # Another worker starts with an empty local cache.
+        cache.clear()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+            'Проверьте, что ETag не зависит от локального кеша процесса'
+        )
+
+    def test_title_write_changes_etag(
+            self, client, admin_client, titles,
+            django_capture_on_commit_callbacks):
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.patch(
+                f'{url}{titles.first().id}/', {'name': 'Новое название'},
+                format='json')
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_author_rename_changes_review_etag(
+            self, client, user_client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        user_client.patch(
+            '/api/v1/users/me/', {'username': 'Renamed'}, format='json')
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что смена username обновляет ETag отзывов'
+        )
+        assert response.json()['results'][0]['author'] == 'Renamed'
+
+    def test_purged_commenter_changes_comment_etag(
+            self, client, review, admin):
+        Comment.objects.create(review=review, author=admin, text='Да')
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        etag = client.get(url)['ETag']
+
+        admin.mark_deleted()
+        while purge_deleted():
+            pass
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что удаление комментариев автора обновляет ETag'
+        )
+        assert response.json()['results'] == []
+
+    def test_writes_within_one_second_change_validators(self, client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        first = datetime(2026, 1, 1, 12, 0, 0, 100000, tzinfo=timezone.utc)
+        titles = Title.objects.filter(pk=review.title_id)
+        titles.update(modified=first)
+        response = client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        titles.update(modified=first.replace(microsecond=700000))
+        second = client.get(url)
+
+        assert second['ETag'] != etag, (
+            'Проверьте, что ETag учитывает доли секунды'
+        )
+        assert second['Last-Modified'] == last_modified
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 200
@@ -0,0 +1,88 @@
+import pytest
+from django.utils import timezone
+from reviews.models import Comment, Review
+
+
+@pytest.fixture
+def title(titles):
+    return titles.first()
+
+
+@pytest.fixture
+def reviews(title, django_user_model):
+    authors = [
+        django_user_model.objects.create(
+            username=f'author{number}', email=f'author{number}@yamdb.fake')
+        for number in range(25)
+    ]
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5)
+        for author in authors
+    ]
+    # Reviews published at the same moment must keep one order.
+    Review.objects.update(pub_date=timezone.now())
+    return reviews
+
+
+def walk(client, url):
+    """Follow next links and return the ids of every page."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append([item['id'] for item in response.json()['results']])
+        url = response.json()['next']
+    return pages, response.json()['previous']
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_reviews_walk_forward_and_back(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+
+        pages, previous = walk(client, url)
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == sorted(
+            (review.id for review in reviews), reverse=True), (
+            'Проверьте, что отзывы с одинаковой датой не теряются '
+            'и не повторяются между страницами'
+        )
+        backward = []
+        while previous:
+            response = client.get(previous)
+            backward.append(
+                [item['id'] for item in response.json()['results']])
+            previous = response.json()['previous']
+        assert backward == pages[-2::-1], (
+            'Проверьте, что ссылки previous возвращают те же страницы'
+        )
+
+    def test_comments_keep_order_of_equal_dates(self, client, title,
+                                                reviews, admin):
+        review = reviews[0]
+        comments = Comment.objects.bulk_create(
+            Comment(review=review, author=admin, text='Комментарий')
+            for _ in range(15)
+        )
+        Comment.objects.update(pub_date=timezone.now())
+        url = (f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+               f'?pagination=cursor')
+
+        pages, _ = walk(client, url)
+
+        assert sum(pages, []) == sorted(
+            Comment.objects.values_list('id', flat=True))
+        assert len(pages) == 2 and len(comments) == 15
+
+    def test_invalid_cursor_is_rejected(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        for cursor in ('not base64', 'cD1ub3QtanNvbg=='):
+            response = client.get(url, {'cursor': cursor})
+
+            assert response.status_code == 404, (
+                'Проверьте, что неверный курсор отклоняется'
+            )
@@ -0,0 +1,176 @@
+import pytest
+from django.core.management import call_command
+from reviews.deletion import purge_deleted
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def title(titles):
+    return titles.first()
+
+
+@pytest.fixture
+def reviews(title, admin, django_user_model):
+    authors = [
+        django_user_model.objects.create(
+            username=f'author{number}', email=f'author{number}@yamdb.fake')
+        for number in range(5)
+    ]
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=number + 1)
+        for number, author in enumerate(authors)
+    ]
+    for review in reviews:
+        Comment.objects.bulk_create(
+            Comment(review=review, author=admin, text='Комментарий')
+            for _ in range(3)
+        )
+    return reviews
+
+
+@pytest.mark.django_db
+class TestTitleDeletion:
+
+    def test_destroy_hides_title_and_keeps_rows(
+            self, admin_client, client, title, reviews,
+            django_assert_max_num_queries):
+        with django_assert_max_num_queries(4):
+            response = admin_client.delete(f'/api/v1/titles/{title.id}/')
+
+        assert response.status_code == 204
+        assert client.get(f'/api/v1/titles/{title.id}/').status_code == 404
+        assert client.get(
+            f'/api/v1/titles/{title.id}/reviews/').status_code == 404
+        assert client.get(
+            f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+        ).status_code == 404
+        names = [item['name'] for item in
+                 client.get('/api/v1/titles/').json()['results']]
+        assert title.name not in names, (
+            'Проверьте, что удалённое произведение скрыто из списка'
+        )
+        assert Review.objects.filter(title=title).count() == 5, (
+            'Проверьте, что отзывы удаляются в фоне, а не в запросе'
+        )
+
+    def test_deleted_title_name_can_be_reused(
+            self, admin_client, title):
+        title.mark_deleted()
+
+        response = admin_client.post('/api/v1/titles/', {
+            'name': title.name, 'year': title.year,
+            'category': title.category.slug, 'genre': ['drama'],
+        }, format='json')
+
+        assert response.status_code == 201
+        assert Title.all_objects.filter(name=title.name).count() == 2
+
+    def test_deleted_field_is_hidden_and_read_only(
+            self, admin_client, client, title):
+        for url in (f'/api/v1/titles/{title.id}/', '/api/v1/titles/',
+                    '/api/v1/titles/top/'):
+            assert 'deleted' not in str(client.get(url).json()), (
+                f'Проверьте, что поле deleted не выводится в {url}'
+            )
+
+        for method in (admin_client.put, admin_client.patch):
+            method(f'/api/v1/titles/{title.id}/', {
+                'name': title.name, 'year': title.year,
+                'deleted': '2020-01-01T00:00:00Z',
+            }, format='json')
+
+        assert Title.objects.filter(pk=title.pk).exists(), (
+            'Проверьте, что поле deleted нельзя изменить через API'
+        )
+
+    def test_purge_removes_title_in_chunks(self, title, reviews):
+        title.mark_deleted()
+
+        steps = []
+        while True:
+            deleted = purge_deleted(chunk_size=4)
+            if not deleted:
+                break
+            steps.append(deleted)
+
+        assert max(steps) <= 4, (
+            'Проверьте, что за один шаг удаляется ограниченное число строк'
+        )
+        assert not Title.all_objects.filter(pk=title.pk).exists()
+        assert not Review.objects.filter(title_id=title.pk).exists()
+        assert not Comment.objects.exists()
+
+
+@pytest.mark.django_db
+class TestUserDeletion:
+
+    def test_destroy_hides_user_and_frees_username(
+            self, admin_client, client, user, title, django_user_model):
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=3)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+
+        assert response.status_code == 204
+        assert admin_client.get(
+            f'/api/v1/users/{user.username}/').status_code == 404
+        assert client.get(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        ).status_code == 404
+        assert client.post('/api/v1/auth/signup/', {
+            'username': user.username, 'email': user.email,
+        }, format='json').status_code == 200
+        assert django_user_model.all_objects.filter(
+            pk=user.pk, deleted__isnull=False).exists()
+
+    def test_delete_does_not_touch_reviews(
+            self, reviews, django_assert_num_queries):
+        author = reviews[0].author
+        Comment.objects.create(review=reviews[1], author=author, text='Да')
+
+        # Only the user row, whatever the number of reviews and comments.
+        with django_assert_num_queries(1):
+            author.mark_deleted()
+
+    def test_deleted_user_token_is_rejected(self, user_client, user):
+        user.mark_deleted()
+
+        response = user_client.get('/api/v1/users/me/')
+
+        assert response.status_code == 401
+
+    def test_purge_updates_ratings_of_other_titles(
+            self, title, reviews, django_user_model):
+        reviews[0].author.mark_deleted()
+
+        call_command('purgedeleted', chunk_size=2)
+
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating_sum) == (4, 14), (
+            'Проверьте, что отзывы удалённого пользователя '
+            'исключаются из рейтинга'
+        )
+        assert not django_user_model.all_objects.filter(
+            username__startswith='deleted:').exists()
+        assert Comment.objects.count() == 12
+
+    def test_purge_chunk_updates_cache_and_ratings_once(
+            self, title, admin, django_user_model,
+            django_capture_on_commit_callbacks):
+        Review.objects.create(title=title, author=admin, text='Да', score=10)
+        for number in range(4):
+            author = django_user_model.objects.create(
+                username=f'author{number}', email=f'a{number}@yamdb.fake')
+            Review.objects.create(
+                title=title, author=author, text='Нет', score=number + 1)
+            author.mark_deleted()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            assert purge_deleted(chunk_size=4) == 4
+
+        assert len(callbacks) == 1, (
+            'Проверьте, что версия кеша меняется один раз за порцию'
+        )
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating_sum) == (1, 10)
@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+
+import pytest
+from reviews.export import export_lines
+from reviews.models import GenreTitle, Review, Title
+
+URL = '/api/v1/titles/export/'
+
+
+@pytest.fixture
+def catalog(category, genres, user):
+    drama, comedy = genres
+    titles = [
+        Title.objects.create(
+            name=f'Произведение {number}', year=1999 + number % 2,
+            category=category, description='Строка, "кавычки"\nи перевод')
+        for number in range(5)
+    ]
+    for title in titles:
+        GenreTitle.objects.create(title=title, genre=drama)
+    GenreTitle.objects.create(title=titles[1], genre=comedy)
+    Review.objects.create(title=titles[0], author=user, text='Да', score=7)
+    titles[4].mark_deleted()
+    return titles
+
+
+def streamed(response):
+    assert response.status_code == 200
+    assert response.streaming
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestTitleExport:
+
+    def test_export_is_for_admins(self, client, user_client):
+        assert client.get(URL).status_code == 401
+        assert user_client.get(URL).status_code == 403
+
+    def test_ndjson_export(self, admin_client, catalog):
+        response = admin_client.get(URL)
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert 'titles.ndjson' in response['Content-Disposition']
+        titles = [
+            json.loads(line) for line in streamed(response).splitlines()]
+        assert [title['id'] for title in titles] == [
+            title.id for title in catalog[:4]], (
+            'Проверьте, что экспорт содержит все не удалённые произведения'
+        )
+        assert titles[0] == {
+            'id': catalog[0].id, 'name': 'Произведение 0', 'year': 1999,
+            'description': 'Строка, "кавычки"\nи перевод',
+            'category': 'films', 'genre': ['drama'], 'rating': 7.0,
+        }
+        assert titles[1]['genre'] == ['comedy', 'drama']
+        assert titles[1]['rating'] is None
+
+    def test_csv_export(self, admin_client, catalog):
+        response = admin_client.get(URL, {'file_format': 'csv'})
+
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.DictReader(io.StringIO(streamed(response))))
+        assert len(rows) == 4
+        assert rows[1]['genre'] == 'comedy,drama'
+        assert rows[0]['description'] == 'Строка, "кавычки"\nи перевод'
+
+    def test_export_applies_filters(self, admin_client, catalog):
+        response = admin_client.get(URL, {'year': 2000, 'genre': 'comedy'})
+
+        titles = [
+            json.loads(line) for line in streamed(response).splitlines()]
+        assert [title['id'] for title in titles] == [catalog[1].id], (
+            'Проверьте, что фильтры списка применяются к экспорту'
+        )
+
+    def test_unknown_format_is_rejected(self, admin_client):
+        response = admin_client.get(URL, {'file_format': 'xml'})
+
+        assert response.status_code == 400
+        assert response.json() == {'file_format': ['ndjson', 'csv']}
+
+    def test_genres_are_read_per_chunk(self, catalog,
+                                       django_assert_num_queries):
+        # One cursor over the titles, one genre query per two titles.
+        with django_assert_num_queries(3):
+            lines = list(export_lines('ndjson', chunk_size=2))
+
+        assert [json.loads(line)['genre'] for line in lines] == [
+            ['drama'], ['comedy', 'drama'], ['drama'], ['drama']]
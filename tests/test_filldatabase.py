@@ -0,0 +1,63 @@
+import pytest
+from django.core.management import call_command
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+CSV = {
+    'category.csv': 'id,name,slug\n1,Фильм,films\n2,Книга,books\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n2,Мастер и Маргарита,1967,2\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,2,1\n3,2,2\n',
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,reader,reader@yamdb.fake,user,,,\n'
+    ),
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Отлично,100,9,2019-09-24T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,100,2019-09-24T21:08:21.567Z\n'
+    ),
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name, content in CSV.items():
+        (tmp_path / name).write_text(content, encoding='utf8')
+    return tmp_path
+
+
+def counts():
+    return [
+        model.objects.count()
+        for model in (Category, Genre, Title, GenreTitle, Review, Comment)
+    ]
+
+
+@pytest.mark.django_db
+class TestFillDatabase:
+
+    def test_second_run_skips_loaded_rows(self, data_dir, caplog):
+        call_command('filldatabase', data_dir=str(data_dir))
+
+        assert counts() == [2, 2, 2, 3, 1, 1]
+        assert 'GenreTitle: 3 rows inserted, 0 already loaded rows skipped' \
+            in caplog.text
+        assert Title.objects.get(pk=1).rating_count == 1
+        caplog.clear()
+
+        call_command('filldatabase', data_dir=str(data_dir), batch_size=1)
+
+        assert counts() == [2, 2, 2, 3, 1, 1], (
+            'Проверьте, что повторная загрузка не дублирует строки'
+        )
+        assert 'Title: 0 rows inserted, 2 already loaded rows skipped' \
+            in caplog.text, (
+                'Проверьте, что команда сообщает число пропущенных строк'
+            )
+        assert 'successfully' not in caplog.text
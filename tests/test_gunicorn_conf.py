@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+import runpy
+
+from django.conf import settings
+
+CONFIG = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+
+
+class TestGunicornConfig:
+
+    def test_defaults(self, monkeypatch, tmp_path):
+        for name in list(os.environ):
+            if name.startswith('GUNICORN_'):
+                monkeypatch.delenv(name)
+        # The config sets the variable for the whole process.
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+
+        config = runpy.run_path(CONFIG)
+
+        assert config['workers'] == multiprocessing.cpu_count() * 2 + 1
+        assert config['worker_class'] == 'gthread'
+        assert config['threads'] > 1
+        assert config['preload_app'] is True
+        assert 0 < config['max_requests_jitter'] < config['max_requests'], (
+            'Проверьте, что воркеры перезапускаются с разбросом'
+        )
+
+    def test_env_overrides(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        monkeypatch.setenv('GUNICORN_WORKERS', '3')
+        monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'sync')
+        monkeypatch.setenv('GUNICORN_PRELOAD', 'false')
+        monkeypatch.setenv('GUNICORN_WORKER_TMP_DIR', '/tmp')
+
+        config = runpy.run_path(CONFIG)
+
+        assert config['workers'] == 3
+        assert config['worker_class'] == 'sync'
+        assert config['preload_app'] is False
+        assert config['worker_tmp_dir'] == '/tmp'
+
+    def test_start_clears_metrics_of_previous_run(
+            self, monkeypatch, tmp_path):
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        (tmp_path / 'counter_1234.db').write_bytes(b'')
+
+        config = runpy.run_path(CONFIG)
+        config['on_starting'](None)
+
+        assert config['metrics_dir'] == str(tmp_path)
+        assert not list(tmp_path.iterdir()), (
+            'Проверьте, что метрики прошлого запуска удаляются'
+        )
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_server_timing_header(self, client, titles):
+        response = client.get('/api/v1/titles/')
+
+        assert response.status_code == 200
+        timing = dict(
+            entry.strip().split(';', 1)
+            for entry in response['Server-Timing'].split(',')
+        )
+        assert set(timing) == {'db', 'view', 'render', 'total', 'queries'}, (
+            'Проверьте, что заголовок Server-Timing содержит время '
+            'запросов к БД, view и рендеринга'
+        )
+        assert timing['queries'] == 'desc="4"'
+
+    def test_metrics_require_admin(self, client, user_client):
+        assert client.get('/api/v1/metrics/').status_code == 401
+        assert user_client.get('/api/v1/metrics/').status_code == 403
+
+    def test_metrics_are_aggregated_per_route(self, client, admin_client,
+                                              titles):
+        client.get('/api/v1/titles/')
+
+        response = admin_client.get('/api/v1/metrics/')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        assert '# TYPE yamdb_request_duration_seconds histogram' in body
+        assert any(
+            line.startswith('yamdb_db_queries_bucket{')
+            and 'route="title-list"' in line and 'method="GET"' in line
+            for line in body.splitlines()
+        ), 'Проверьте, что метрики собираются по именам маршрутов'
+        assert 'yamdb_catalog_cache_total{result="misses"}' in body
+
+    def test_metrics_are_shared_between_processes(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+
+        def run(code):
+            return subprocess.run(
+                [sys.executable, '-c', f'from api import metrics; {code}'],
+                cwd=settings.BASE_DIR, env=env, check=True,
+                capture_output=True, text=True
+            ).stdout
+
+        for _ in range(2):
+            run("metrics.RESPONSES.labels('title-list', 'GET', 200).inc()")
+        body = run('print(metrics.render())')
+
+        assert ('yamdb_responses_total{method="GET",route="title-list",'
+                'status="200"} 2.0') in body, (
+            'Проверьте, что метрики всех воркеров суммируются'
+        )
+        assert 'pid=' not in body
+
+    def test_cache_stats_are_read_from_all_workers(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+        code = ("from api import metrics; "
+                "metrics.CATALOG_CACHE.labels('{}').inc()")
+        for result in ('hits', 'hits', 'misses'):
+            subprocess.run([sys.executable, '-c', code.format(result)],
+                           cwd=settings.BASE_DIR, env=env, check=True)
+
+        output = subprocess.run(
+            [sys.executable, 'manage.py', 'catalogcachestats'],
+            cwd=settings.BASE_DIR, env=env, check=True,
+            capture_output=True, text=True
+        ).stdout
+
+        assert output.strip() == 'hits=2 misses=1 hit_ratio=66.67%', (
+            'Проверьте, что команда суммирует счётчики всех воркеров'
+        )
+
+    def test_cache_stats_refuse_process_local_counters(self, monkeypatch):
+        monkeypatch.delenv('PROMETHEUS_MULTIPROC_DIR', raising=False)
+
+        with pytest.raises(CommandError):
+            call_command('catalogcachestats')
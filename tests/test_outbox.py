@@ -0,0 +1,103 @@
+from smtplib import SMTPException
+
+import pytest
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from django.utils import timezone
+from users.models import OutgoingEmail
+from users.outbox import RETRY_DELAY, enqueue, send_pending
+
+
+class BrokenBackend(BaseEmailBackend):
+    """Mail backend of a server that cannot be reached."""
+
+    def open(self):
+        raise SMTPException('Connection refused')
+
+    def send_messages(self, messages):
+        raise SMTPException('Connection refused')
+
+
+class InspectingBackend(BaseEmailBackend):
+    """Mail backend that notes the state of the outbox while sending."""
+
+    seen = []
+
+    def send_messages(self, messages):
+        InspectingBackend.seen.append((
+            connection.in_atomic_block,
+            list(OutgoingEmail.objects.values_list('attempts', 'send_after')),
+        ))
+        return len(messages)
+
+
+def queue(number=1):
+    for index in range(number):
+        enqueue('Код', f'Письмо {index}', 'from@yamdb.fake',
+                f'user{index}@yamdb.fake')
+
+
+@pytest.fixture
+def mailbox(settings, tmp_path):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+    settings.EMAIL_FILE_PATH = str(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_signup_email_is_sent_once(self, client, mailbox):
+        response = client.post('/api/v1/auth/signup/', {
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake',
+        })
+        assert response.status_code == 200
+
+        assert send_pending() == 1
+        assert send_pending() == 0, (
+            'Проверьте, что отправленное письмо не отправляется повторно'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.sent is not None and email.attempts == 1
+        content = ''.join(path.read_text() for path in mailbox.iterdir())
+        assert 'newcomer@yamdb.fake' in content
+        assert 'confirmation_code' in content
+
+    def test_failure_is_logged_and_retried_later(self, settings, caplog):
+        settings.EMAIL_BACKEND = 'tests.test_outbox.BrokenBackend'
+        queue()
+        before = timezone.now()
+
+        assert send_pending() == 0
+
+        email = OutgoingEmail.objects.get()
+        assert email.sent is None and email.attempts == 1
+        assert email.last_error == 'Connection refused'
+        assert email.send_after >= before + RETRY_DELAY * 2
+        assert any(
+            record.name == 'users.outbox' for record in caplog.records
+        ), 'Проверьте, что ошибки отправки попадают в журнал'
+        assert send_pending() == 0
+        assert OutgoingEmail.objects.get().attempts == 1, (
+            'Проверьте, что письмо повторяется только после паузы'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_emails_are_sent_after_the_claim_commits(settings):
+    settings.EMAIL_BACKEND = 'tests.test_outbox.InspectingBackend'
+    InspectingBackend.seen.clear()
+    queue(2)
+    started = timezone.now()
+
+    assert send_pending() == 2
+
+    assert len(InspectingBackend.seen) == 2
+    for in_transaction, rows in InspectingBackend.seen:
+        assert not in_transaction, (
+            'Проверьте, что письма отправляются вне транзакции'
+        )
+        assert all(
+            attempts == 1 and send_after > started
+            for attempts, send_after in rows
+        ), 'Проверьте, что пакет писем занимается до отправки'
@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from reviews.models import Review, Title
+from reviews.ratings import expire_activity, rebuild_ratings
+
+
+@pytest.fixture
+def authors(django_user_model):
+    return [
+        django_user_model.objects.create_user(
+            username=f'author{number}', email=f'author{number}@yamdb.fake')
+        for number in range(20)
+    ]
+
+
+def review(title, authors, *scores):
+    for author, score in zip(authors, scores):
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=score)
+
+
+def rankings():
+    return list(Title.objects.order_by('pk').values_list(
+        'rating_sum', 'rating_count', 'weighted_rating', 'recent_reviews'))
+
+
+@pytest.mark.django_db
+class TestTopTitles:
+    url = '/api/v1/titles/top/'
+
+    def test_top_is_ordered_by_weighted_rating(self, client, titles,
+                                               authors):
+        single, popular, plain = titles[:3]
+        review(single, authors, 10)
+        review(popular, authors, *[9] * 20)
+        review(plain, authors, 8, 8, 8)
+
+        response = client.get(self.url)
+
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            popular.id, plain.id, single.id], (
+            'Проверьте, что одна высокая оценка не поднимает произведение '
+            'выше многих хороших'
+        )
+        weight = settings.RATING_PRIOR_WEIGHT
+        assert results[0]['weighted_rating'] == pytest.approx(
+            (180 + weight * settings.RATING_PRIOR_MEAN) / (20 + weight))
+
+    def test_top_is_filtered_and_stays_incremental(self, client, titles,
+                                                   authors, category):
+        title = titles.first()
+        other = Title.objects.create(name='Другое', year=2000)
+        review(title, authors, 8, 7)
+        review(other, authors, 10, 10)
+        Review.objects.filter(title=other, author=authors[0]).delete()
+        changed = Review.objects.get(title=title, author=authors[0])
+        changed.score = 3
+        changed.save()
+
+        response = client.get(self.url, {'category': category.slug})
+
+        assert [item['id'] for item in response.json()['results']] == [
+            title.id]
+        incremental = rankings()
+        rebuild_ratings()
+        assert rankings() == pytest.approx(incremental), (
+            'Проверьте, что рейтинги обновляются при изменении отзывов'
+        )
+
+    def test_top_reads_one_page(self, client, titles, authors,
+                                django_assert_max_num_queries):
+        review(titles[0], authors, 5)
+
+        with django_assert_max_num_queries(3):
+            response = client.get(self.url, {'genre': 'drama'})
+
+        assert response.status_code == 200
+        assert 'next' in response.json()
+
+
+    def test_tied_ratings_page_by_keyset(
+            self, client, authors, django_assert_num_queries):
+        titles = [
+            Title.objects.create(name=f'Произведение {number}', year=2000)
+            for number in range(35)
+        ]
+        for title in titles:
+            review(title, authors, 7)
+
+        ids, url = [], self.url
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            pages.append(url)
+            ids += [title['id'] for title in response.json()['results']]
+            url = response.json()['next']
+
+        assert ids == sorted((title.id for title in titles), reverse=True), (
+            'Проверьте, что страницы с равным рейтингом не теряют '
+            'и не повторяют произведения'
+        )
+        cache.clear()
+        # Cache version, page and genres.
+        with django_assert_num_queries(3) as context:
+            response = client.get(pages[-1])
+        sql = context.captured_queries[1]['sql']
+        assert 'OFFSET' not in sql and '"id" <' in sql, (
+            'Проверьте, что курсор хранит рейтинг и id последней строки'
+        )
+        previous = response.json()['previous']
+        assert [title['id'] for title in client.get(previous).json()[
+            'results']] == ids[20:30]
+
+    def test_invalid_cursor_is_rejected(self, client):
+        # Positions "not-json", ["x", 1] and [7].
+        for cursor in ('cD1ub3QtanNvbg==', 'cD0lNUIlMjJ4JTIyJTJDKzElNUQ=',
+                       'cD0lNUI3JTVE'):
+            response = client.get(self.url, {'cursor': cursor})
+            assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestTrendingTitles:
+    url = '/api/v1/titles/trending/'
+
+    def test_trending_is_ordered_by_recent_reviews(self, client, titles,
+                                                   authors):
+        quiet, busy, old = titles[:3]
+        review(quiet, authors, 5)
+        review(busy, authors, 5, 6, 7)
+        review(old, authors, *[5] * 10)
+        Review.objects.filter(title=old).update(
+            pub_date=timezone.now() - timedelta(
+                days=settings.TRENDING_WINDOW_DAYS))
+        rebuild_ratings()
+
+        response = client.get(self.url)
+
+        assert [title['id'] for title in response.json()['results']] == [
+            busy.id, quiet.id], (
+            'Проверьте, что учитываются только отзывы из окна трендов'
+        )
+        assert response.json()['results'][0]['recent_reviews'] == 3
+
+    def test_window_moves_incrementally(self, titles, authors):
+        title = titles[0]
+        review(title, authors, 5, 6)
+        Review.objects.filter(author=authors[0]).delete()
+        title.refresh_from_db()
+        assert title.recent_reviews == 1
+
+        assert expire_activity() == 0
+        later = timezone.localdate() + timedelta(
+            days=settings.TRENDING_WINDOW_DAYS)
+        assert expire_activity(later) == 1
+
+        title.refresh_from_db()
+        assert title.recent_reviews == 0, (
+            'Проверьте, что отзывы вне окна трендов перестают учитываться'
+        )
+        assert not title.activity.exists()
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Review, Title
+
+
+def totals(title):
+    title.refresh_from_db()
+    return title.rating_sum, title.rating_count, title.rating
+
+
+@pytest.mark.django_db
+class TestStoredRatings:
+
+    def test_totals_follow_review_writes(self, user_client, admin_client,
+                                         titles):
+        title = titles.first()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        response = user_client.post(url, {'text': 'Да', 'score': 9})
+        assert response.status_code == 201
+        admin_client.post(url, {'text': 'Нет', 'score': 4})
+        assert totals(title) == (13, 2, 6.5), (
+            'Проверьте, что новый отзыв добавляется в сумму и число оценок'
+        )
+
+        review = response.json()['id']
+        response = user_client.patch(f'{url}{review}/', {'score': 2})
+        assert response.status_code == 200
+        assert totals(title) == (6, 2, 3), (
+            'Проверьте, что изменение оценки меняет только сумму оценок'
+        )
+
+        assert user_client.delete(f'{url}{review}/').status_code == 204
+        assert totals(title) == (4, 1, 4), (
+            'Проверьте, что удалённый отзыв вычитается из рейтинга'
+        )
+        assert admin_client.get(f'/api/v1/titles/{title.id}/').json()[
+            'rating'] == 4
+
+    def test_text_edit_keeps_totals(self, user_client, titles):
+        title = titles.first()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        review = user_client.post(url, {'text': 'Да', 'score': 7}).json()
+
+        user_client.patch(f'{url}{review["id"]}/', {'text': 'Уточнение'})
+
+        assert totals(title) == (7, 1, 7)
+
+    def test_rebuild_repairs_drifted_totals(self, user, admin, titles):
+        first, second = titles[:2]
+        Review.objects.create(title=first, author=user, text='Да', score=8)
+        Review.objects.create(title=first, author=admin, text='Нет', score=3)
+        Title.objects.filter(pk=first.pk).update(
+            rating_sum=100, rating_count=1)
+        Title.objects.filter(pk=second.pk).update(
+            rating_sum=5, rating_count=1)
+        output = io.StringIO()
+
+        call_command('rebuildratings', stdout=output)
+
+        assert totals(first) == (11, 2, 5.5), (
+            'Проверьте, что rebuildratings пересчитывает рейтинг по отзывам'
+        )
+        assert totals(second) == (0, 0, None)
+        assert 'Ratings rebuilt' in output.getvalue()
@@ -0,0 +1,49 @@
+import datetime
+import io
+
+import pytest
+from api.v1.parsers import ORJSONParser
+from api.v1.renderers import ORJSONRenderer
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from users.models import User
+
+
+class TestORJSONRenderer:
+
+    def test_output_matches_json_renderer(self):
+        data = {
+            'pub_date': datetime.datetime(
+                2021, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            'year': datetime.date(2021, 5, 1),
+            'role': User.Roles.ADMIN.label,
+            'roles': User.Roles.choices,
+            'rating': 7.5,
+            'name': 'Фильм\u2028\u2029',
+            'genre': [{'slug': 'drama'}],
+            1: None,
+        }
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что ORJSONRenderer выводит те же байты, '
+            'что и JSONRenderer'
+        )
+
+    def test_empty_response(self):
+        assert ORJSONRenderer().render(None) == b''
+
+
+class TestORJSONParser:
+
+    def test_parse(self):
+        stream = io.BytesIO(
+            '{"name": "Фильм", "genre": ["drama"]}'.encode())
+
+        assert ORJSONParser().parse(stream) == {
+            'name': 'Фильм', 'genre': ['drama']}
+
+    def test_invalid_json(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(
+                io.BytesIO(b'{"name": '))
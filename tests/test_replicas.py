@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client
+from reviews.models import Category, Review, Title
+
+
+@pytest.fixture
+def replica(db, settings, tmp_path):
+    """Second SQLite database standing in for a read replica."""
+    connections.databases['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    call_command('migrate', database='replica', verbosity=0)
+    settings.DATABASE_REPLICAS = ['replica']
+    yield 'replica'
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+
+    def test_get_reads_from_replica(self, replica, client):
+        Title.objects.create(name='На основной базе', year=2000)
+        Title.objects.using(replica).create(name='На реплике', year=2000)
+
+        response = client.get('/api/v1/titles/')
+
+        assert response.status_code == 200
+        assert [title['name'] for title in response.json()['results']] == [
+            'На реплике'
+        ], 'Проверьте, что GET-запросы читают данные с реплики'
+
+    def test_post_writes_to_primary(self, replica, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Фильмы', 'slug': 'films'})
+
+        assert response.status_code == 201
+        assert Category.objects.filter(slug='films').exists()
+        assert not Category.objects.using(replica).exists()
+
+    def test_client_reads_own_writes(self, replica, client, user,
+                                     user_client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 7})
+
+        assert response.status_code == 201
+        assert Review.objects.filter(author=user).exists()
+        response = user_client.get(url)
+        assert response.status_code == 200
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после записи клиент читает с основной базы'
+        )
+        assert client.get(url).status_code == 404, (
+            'Проверьте, что остальные клиенты читают с реплики'
+        )
+
+    def test_sticky_marker_follows_the_client(self, replica, client):
+        response = client.post('/api/v1/auth/signup/', {
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake',
+        })
+
+        assert response.status_code == 200
+        assert 'replica_sticky' in response.cookies
+        # Another worker does not share the local cache of this one.
+        cache.clear()
+        Title.objects.create(name='На основной базе', year=2000)
+        assert client.get('/api/v1/titles/').json()['count'] == 1, (
+            'Проверьте, что отметка о записи хранится у клиента'
+        )
+        other = Client(REMOTE_ADDR=client.defaults.get('REMOTE_ADDR'))
+        assert other.get('/api/v1/titles/').json()['count'] == 0, (
+            'Проверьте, что анонимные клиенты с одного адреса '
+            'не делят отметку о записи'
+        )
+
+    def test_forged_sticky_cookie_is_ignored(self, replica, client):
+        Title.objects.create(name='На основной базе', year=2000)
+        client.cookies['replica_sticky'] = '1'
+
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+
+    def test_export_streams_from_replica(self, replica, admin, admin_client):
+        admin.save(using=replica)
+        Title.objects.create(name='На основной базе', year=2000)
+        Title.objects.using(replica).create(name='На реплике', year=2000)
+
+        response = admin_client.get('/api/v1/titles/export/')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)['name'] for line in lines] == [
+            'На реплике'
+        ], 'Проверьте, что экспорт читает с реплики и после ответа'
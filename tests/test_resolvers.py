@@ -0,0 +1,79 @@
+import pytest
+from reviews.models import Comment, Review
+
+
+@pytest.fixture
+def title(titles):
+    return titles.first()
+
+
+@pytest.fixture
+def review(title, admin):
+    return Review.objects.create(
+        title=title, author=admin, text='Отзыв', score=5)
+
+
+@pytest.mark.django_db
+class TestParentResolver:
+
+    def test_review_create_resolves_title_once(
+            self, user_client, title, django_assert_max_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        with django_assert_max_num_queries(11) as context:
+            response = user_client.post(
+                url, {'text': 'Отлично', 'score': 9}, format='json')
+
+        assert response.status_code == 201
+        # The rating totals are read back after the update, see
+        # reviews.ratings.apply_score().
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if '"reviews_title"."name"' in query['sql']
+            and query['sql'].startswith('SELECT')
+        ]
+        assert len(selects) == 1, (
+            'Проверьте, что произведение загружается один раз за запрос'
+        )
+
+    def test_duplicate_review_is_rejected(self, user_client, user, title):
+        Review.objects.create(title=title, author=user, text='Был', score=1)
+
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            {'text': 'Снова', 'score': 2}, format='json')
+
+        assert response.status_code == 400
+        assert 'non_field_errors' in response.json()
+        assert Review.objects.filter(title=title).count() == 1
+
+    def test_comment_create_joins_review_and_title(
+            self, user_client, title, review,
+            django_assert_max_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+
+        with django_assert_max_num_queries(4) as context:
+            response = user_client.post(url, {'text': 'Да'}, format='json')
+
+        assert response.status_code == 201
+        parents = [
+            query['sql'] for query in context.captured_queries
+            if '"reviews_review"' in query['sql']
+            and query['sql'].startswith('SELECT')
+        ]
+        assert len(parents) == 1 and '"reviews_title"' in parents[0], (
+            'Проверьте, что отзыв загружается вместе с произведением '
+            'одним запросом'
+        )
+
+    def test_parent_of_other_title_is_not_found(self, user_client, titles,
+                                                review):
+        other = titles.last()
+        base = f'/api/v1/titles/{other.id}/reviews/{review.id}'
+
+        assert user_client.post(
+            f'{base}/comments/', {'text': 'Нет'}, format='json'
+        ).status_code == 404
+        assert user_client.get(f'{base}/').status_code == 404
+        assert user_client.get(f'{base}/comments/').status_code == 404
+        assert not Comment.objects.exists()
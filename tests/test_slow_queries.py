@@ -0,0 +1,66 @@
+import pytest
+from api.models import SlowQuery
+
+
+@pytest.fixture
+def capture(settings):
+    settings.SLOW_QUERY_CAPTURE = True
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_SAMPLE_RATE = 1
+
+
+@pytest.mark.django_db
+class TestSlowQueries:
+
+    def test_capture_is_disabled_by_default(self, client, titles):
+        assert client.get('/api/v1/titles/').status_code == 200
+
+        assert not SlowQuery.objects.exists()
+
+    def test_slow_queries_are_stored_with_plan(self, capture, client, titles,
+                                               caplog):
+        response = client.get('/api/v1/titles/', {'category': 'films'})
+
+        assert response.status_code == 200
+        queries = SlowQuery.objects.filter(view='TitleViewSet.list')
+        assert queries.count() == 4, (
+            'Проверьте, что запросы привязываются к view и action'
+        )
+        query = queries.filter(sql__contains='"reviews_category"').first()
+        assert query.path == '/api/v1/titles/'
+        assert 'films' in query.params
+        assert query.plan, 'Проверьте, что для запроса собирается EXPLAIN'
+        assert any(
+            record.name == 'api.slowqueries' for record in caplog.records
+        )
+
+    def test_write_params_are_redacted(self, capture, client, caplog,
+                                       django_user_model):
+        response = client.post('/api/v1/auth/signup/', {
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake',
+        })
+
+        assert response.status_code == 200
+        writes = SlowQuery.objects.exclude(sql__startswith='SELECT')
+        assert writes.filter(sql__startswith='UPDATE').exists()
+        assert set(writes.values_list('params', flat=True)) == {''}, (
+            'Проверьте, что параметры записей не сохраняются'
+        )
+        code = django_user_model.objects.get(
+            username='newcomer').confirmation_code
+        assert code and not any(
+            code in record.getMessage() for record in caplog.records)
+
+    def test_capture_is_not_timed(self, capture, client, titles):
+        response = client.get('/api/v1/titles/')
+
+        assert response['Server-Timing'].endswith('queries;desc="4"'), (
+            'Проверьте, что сохранение запросов не входит в Server-Timing'
+        )
+
+    def test_sampling_skips_requests(self, capture, settings, client, titles):
+        settings.SLOW_QUERY_SAMPLE_RATE = 0
+
+        assert client.get('/api/v1/titles/').status_code == 200
+
+        assert not SlowQuery.objects.exists()
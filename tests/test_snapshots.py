@@ -0,0 +1,113 @@
+import gzip
+import io
+import json
+import os
+import re
+
+import brotli
+import pytest
+from django.core.management import call_command
+
+from .conftest import infra_dir_path
+
+
+def read(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+@pytest.mark.django_db
+class TestSnapshotCatalog:
+
+    def snapshot(self, tmp_path):
+        call_command(
+            'snapshotcatalog', '--pages', '2', '--root', str(tmp_path),
+            '--base-url', 'http://testserver', stdout=io.StringIO())
+
+    def test_pages_match_api_responses(self, tmp_path, client, titles):
+        self.snapshot(tmp_path)
+
+        pages = {
+            'categories/index.json': ('/api/v1/categories/', {}),
+            'genres/index.json': ('/api/v1/genres/', {}),
+            'titles/index.json': ('/api/v1/titles/', {}),
+            'titles/page-2.json': ('/api/v1/titles/', {'page': 2}),
+            'titles/category-films.json': (
+                '/api/v1/titles/', {'category': 'films'}),
+            'titles/category-films-page-2.json': (
+                '/api/v1/titles/', {'category': 'films', 'page': 2}),
+        }
+        for name, (path, params) in pages.items():
+            content = read(tmp_path / 'api/v1' / name)
+            assert json.loads(content) == client.get(path, params).json(), (
+                f'Проверьте, что снимок {name} совпадает с ответом API'
+            )
+            assert gzip.decompress(read(
+                tmp_path / 'api/v1' / f'{name}.gz')) == content
+            assert brotli.decompress(read(
+                tmp_path / 'api/v1' / f'{name}.br')) == content
+        assert not (tmp_path / 'api/v1/titles/page-3.json').exists(), (
+            'Проверьте, что сохраняется не больше --pages страниц'
+        )
+
+    def test_unchanged_files_are_kept_and_stale_removed(self, tmp_path,
+                                                        titles):
+        self.snapshot(tmp_path)
+        index = tmp_path / 'api/v1/titles/index.json'
+        os.utime(index, (0, 0))
+        stale = tmp_path / 'api/v1/titles/category-old.json'
+        stale.write_bytes(b'{}')
+
+        self.snapshot(tmp_path)
+
+        assert index.stat().st_mtime == 0, (
+            'Проверьте, что неизменённые страницы не перезаписываются'
+        )
+        assert not stale.exists(), (
+            'Проверьте, что страницы удалённых категорий удаляются'
+        )
+        assert not [
+            name for name in os.listdir(tmp_path / 'api/v1/titles')
+            if name.startswith('.tmp-')
+        ]
+
+
+def snapshot_map():
+    """Return the key and the regex entries of the nginx snapshot map."""
+    with open(os.path.join(infra_dir_path, 'nginx', 'default.conf')) as file:
+        conf = file.read()
+    key, body = re.search(
+        r'map (\S+) \$catalog_snapshot \{(.*?)\}', conf, re.S).groups()
+    entries = [
+        (re.compile(pattern.replace('(?<', '(?P<')), name)
+        for pattern, name in re.findall(r'"~(.*)" (\S+);', body)
+    ]
+    return key, entries
+
+
+@pytest.mark.parametrize('method, args, authorization, sticky, expected', [
+    ('GET', '', '', '', 'index'),
+    ('HEAD', 'category=films&page=2', '', '', 'category-$slug-page-$page'),
+    ('POST', '', '', '', ''),
+    ('GET', 'year=1999', '', '', ''),
+    ('GET', '', 'Bearer token', '', ''),
+    ('GET', 'page=2', '', 'signed-value', ''),
+])
+def test_nginx_serves_snapshots_to_anonymous_reads(
+        method, args, authorization, sticky, expected):
+    key, entries = snapshot_map()
+    values = {
+        '$request_method': method, '$args': args,
+        '$http_authorization': authorization,
+        '$cookie_replica_sticky': sticky,
+    }
+    assert set(key.split(':')) == set(values)
+    request = ':'.join(values[name] for name in key.split(':'))
+
+    name = next(
+        (name for pattern, name in entries if pattern.search(request)), '')
+
+    assert name == expected, (
+        'Проверьте, что nginx отдаёт снимок только анонимным запросам '
+        'без привязки к основной базе'
+    )
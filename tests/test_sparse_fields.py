@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+
+    def test_fields_limit_titles_and_columns(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                '/api/v1/titles/', {'fields': 'name,year,rating'})
+
+        assert response.status_code == 200
+        assert all(
+            set(title) == {'name', 'year', 'rating'}
+            for title in response.json()['results']
+        ), 'Проверьте, что параметр fields ограничивает поля ответа'
+        # cache version and titles, no category join or genre prefetch
+        assert len(context) == 3, (
+            'Проверьте, что без категории и жанров не выполняются JOIN '
+            'и prefetch'
+        )
+        assert 'description' not in context.captured_queries[2]['sql'], (
+            'Проверьте, что невыбранные поля не читаются из базы данных'
+        )
+
+    def test_omit_excludes_fields_and_columns(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/', {'omit': 'description'})
+
+        assert response.status_code == 200
+        title = response.json()['results'][0]
+        assert 'description' not in title
+        assert title['category']['slug'] == 'films'
+        assert len(title['genre']) == 2
+        assert all(
+            'description' not in query['sql']
+            for query in context.captured_queries
+        )
+
+    def test_unknown_field_is_rejected(self, client, titles):
+        response = client.get('/api/v1/titles/', {'fields': 'name,unknown'})
+
+        assert response.status_code == 400
+        assert 'fields' in response.json()
+
+    def test_fields_limit_reviews(self, client, user, titles):
+        title = titles.first()
+        Review.objects.create(
+            title=title, author=user, text='Длинный текст', score=5)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'/api/v1/titles/{title.id}/reviews/',
+                {'fields': 'author,score'}
+            )
+
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'author': user.username, 'score': 5}]
+        assert all(
+            '"text"' not in query['sql']
+            for query in context.captured_queries
+        )
+
+    def test_fields_keep_cursor_ordering_columns(
+            self, client, titles, django_user_model,
+            django_assert_num_queries):
+        title = titles.first()
+        for number in range(12):
+            author = django_user_model.objects.create(
+                username=f'author{number}', email=f'author{number}@yamdb.fake')
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        # Title and the page with its authors, no deferred loads.
+        with django_assert_num_queries(2):
+            response = client.get(
+                url, {'pagination': 'cursor', 'fields': 'author,score'})
+
+        assert response.status_code == 200
+        assert response.json()['next']
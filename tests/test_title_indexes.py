@@ -0,0 +1,83 @@
+import itertools
+import re
+
+import pytest
+from api.v1.filters import TitleFilter
+from api.v1.views import TitleViewSet
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.seed import seed_catalog
+
+FILTERS = {'category': 'category-3', 'genre': 'genre-7', 'year': 1950}
+
+# EXPLAIN prefix, plan lines that walk a whole table or index, lines
+# that read rows through an index condition and lines of a sort.
+PLANS = {
+    'sqlite': (
+        'EXPLAIN QUERY PLAN ',
+        re.compile(r'\bSCAN\b'),
+        re.compile(r'\bSEARCH \w+ USING .*(INDEX|PRIMARY KEY)'),
+        re.compile(r'USE TEMP B-TREE'),
+    ),
+    'postgresql': (
+        'EXPLAIN ',
+        re.compile(r'Seq Scan'),
+        re.compile(r'Index Cond'),
+        re.compile(r'\bSort\b'),
+    ),
+}
+
+
+@pytest.fixture
+def catalog():
+    seed_catalog(titles=20000, reviews_per_title=0, comments_per_review=0)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def explain(prefix, queryset):
+    """Return the plans of the first page and of the paginator count."""
+    with CaptureQueriesContext(connection) as context:
+        queryset.count()
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + context.captured_queries[-1]['sql'])
+        count = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+    return queryset[:10].explain(), count
+
+
+@pytest.mark.django_db
+def test_title_filters_use_indexes(catalog):
+    if connection.vendor not in PLANS:
+        pytest.skip(f'No plan checks for {connection.vendor}')
+    prefix, walk, search, sort = PLANS[connection.vendor]
+    failures = {}
+    for size in range(1, len(FILTERS) + 1):
+        for names in itertools.combinations(FILTERS, size):
+            params = {name: FILTERS[name] for name in names}
+            queryset = TitleFilter(
+                params, queryset=TitleViewSet.queryset.all()).qs
+            page, count = explain(prefix, queryset)
+            for plan in (page, count):
+                if walk.search(plan) or not search.search(plan):
+                    failures[', '.join(names)] = plan
+            # Genre links cannot be read in title name order, so the
+            # titles of a genre are sorted.
+            if 'genre' not in names and sort.search(page):
+                failures[', '.join(names)] = page
+    assert not failures, (
+        'Проверьте индексы для фильтров списка произведений:\n' + '\n'.join(
+            f'{names}:\n{plan}' for names, plan in failures.items())
+    )
+
+
+@pytest.mark.django_db
+def test_title_page_reads_in_index_order(catalog):
+    if connection.vendor not in PLANS:
+        pytest.skip(f'No plan checks for {connection.vendor}')
+    # Without filters the count reads every title anyway, the page must
+    # stop after its rows.
+    plan = TitleViewSet.queryset.all()[:10].explain()
+
+    assert not PLANS[connection.vendor][3].search(plan), plan
+    assert re.search(
+        r'SCAN reviews_title USING INDEX|Index Scan using', plan), plan
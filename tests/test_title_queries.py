@@ -0,0 +1,105 @@
+import pytest
+from api.v1 import registry
+from rest_framework.pagination import PageNumberPagination
+from reviews.models import Genre, GenreTitle
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+
+    @pytest.mark.parametrize('page_size', (10, 100, 1000))
+    def test_titles_list_queries(self, client, titles, monkeypatch,
+                                 django_assert_num_queries, page_size):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+
+        # cache version, count, titles with category, genres prefetch
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == page_size, (
+            'Проверьте, что список произведений разбит на страницы'
+        )
+        assert all(len(title['genre']) == 2 for title in results), (
+            'Проверьте, что у произведений выводятся жанры'
+        )
+
+    def test_title_detail_queries(self, client, titles,
+                                  django_assert_num_queries):
+        title = titles.first()
+
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+
+        assert response.status_code == 200
+        assert response.json()['category']['slug'] == 'films'
+
+    @pytest.mark.parametrize('count', (1, 20))
+    def test_title_write_queries(self, admin_client, category, count,
+                                 django_assert_num_queries):
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(40)
+        )
+        payload = {
+            'name': 'Произведение', 'year': 2000, 'category': category.slug,
+            'genre': [f'genre-{number}' for number in range(count)],
+        }
+        admin_client.post('/api/v1/titles/', payload, format='json')
+        registry.genres.clear()
+
+        # category and genre versions, genres snapshot, unique check,
+        # insert, links, genres
+        with django_assert_num_queries(7):
+            response = admin_client.post(
+                '/api/v1/titles/', dict(payload, name='Другое'),
+                format='json')
+
+        assert response.status_code == 201
+        title = response.json()
+        assert len(title['genre']) == count
+
+        # genre version, title with genres, unique check, update,
+        # current links, links to delete, delete, insert, genres
+        with django_assert_num_queries(10):
+            response = admin_client.patch(
+                f'/api/v1/titles/{title["id"]}/',
+                {'genre': [f'genre-{number}' for number in range(1, 40, 2)]},
+                format='json')
+
+        assert response.status_code == 200
+        assert len(response.json()['genre']) == 20, (
+            'Проверьте, что жанры произведения заменяются при изменении'
+        )
+        assert GenreTitle.objects.filter(title_id=title['id']).count() == 20
+
+    def test_registry_follows_genre_writes(
+            self, admin_client, category, genres,
+            django_capture_on_commit_callbacks):
+        payload = {
+            'name': 'Произведение', 'year': 2000, 'category': category.slug,
+            'genre': ['drama'],
+        }
+        assert admin_client.post(
+            '/api/v1/titles/', payload, format='json').status_code == 201
+        Genre.objects.bulk_create([Genre(name='Новый', slug='new')])
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.delete('/api/v1/genres/drama/')
+
+        response = admin_client.post(
+            '/api/v1/titles/', dict(payload, name='Другое',
+                                    genre=['new', 'drama']),
+            format='json')
+
+        assert response.status_code == 400
+        assert response.json()['genre'] == [
+            'Object with slug=drama does not exist.'], (
+            'Проверьте, что удалённые жанры не остаются в снимке'
+        )
+        response = admin_client.post(
+            '/api/v1/titles/', dict(payload, name='Другое', genre=['new']),
+            format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что жанры, которых нет в снимке, ищутся в базе'
+        )
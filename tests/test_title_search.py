@@ -0,0 +1,40 @@
+import pytest
+from reviews.models import Title
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    @pytest.fixture
+    def catalog(self, category):
+        for name in ('Война и мир', 'Мир', 'Властелин колец', 'Миротворец'):
+            Title.objects.create(name=name, year=2000, category=category)
+
+    def search(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_search_ranks_by_relevance(self, client, catalog):
+        names = self.search(client, 'мир')
+
+        assert set(names) == {'Война и мир', 'Мир', 'Миротворец'}, (
+            'Проверьте, что поиск находит произведения по словам и префиксам'
+        )
+        assert names[0] == 'Мир', (
+            'Проверьте, что результаты поиска упорядочены по релевантности'
+        )
+
+    def test_search_index_follows_updates(self, client, catalog):
+        title = Title.objects.get(name='Мир')
+        title.name = 'Тишина'
+        title.save()
+
+        assert 'Тишина' not in self.search(client, 'мир')
+        assert self.search(client, 'тиш') == ['Тишина'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения'
+        )
+
+    def test_search_ignores_query_syntax(self, client, catalog):
+        assert self.search(client, '"*:&') == []